@@ -0,0 +1,87 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+from .cache import get_auth_version
+
+TOKEN_KEY = 'auth_token:{key}'
+
+
+class LocalTokenCache:
+    """LRU токенов в памяти процесса с коротким временем жизни."""
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            token, version, expires = item
+            if expires < time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return token, version
+
+    def set(self, key, token, version):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._items[key] = (
+                token, version, time.monotonic() + self.timeout
+            )
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+local_tokens = LocalTokenCache(
+    settings.TOKEN_LOCAL_CACHE_SIZE, settings.TOKEN_LOCAL_CACHE_TIMEOUT
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication без запроса к БД на каждый вызов API.
+
+    Токен ищется сначала в памяти процесса, потом в общем кэше. Каждая
+    запись хранит версию токенов своего пользователя, которую сбрасывают
+    выход, смена пароля и любое изменение пользователя. Версия читается
+    из общего кэша на каждом запросе, поэтому включать класс можно только
+    с общим CACHE_BACKEND (см. TOKEN_CACHE в settings.py).
+    """
+
+    def get_cached(self, key):
+        entry = local_tokens.get(key)
+        if entry is None:
+            entry = cache.get(TOKEN_KEY.format(key=key))
+            if entry is not None:
+                local_tokens.set(key, *entry)
+        return entry
+
+    def authenticate_credentials(self, key):
+        entry = self.get_cached(key)
+        if entry is None or entry[1] != get_auth_version(entry[0].user_id):
+            _, token = super().authenticate_credentials(key)
+            entry = (token, get_auth_version(token.user_id))
+            cache.set(
+                TOKEN_KEY.format(key=key), entry, settings.TOKEN_CACHE_TIMEOUT
+            )
+            local_tokens.set(key, *entry)
+        # Пользователь может измениться внутри запроса, поэтому
+        # разные запросы не должны делить один объект.
+        token = copy.deepcopy(entry[0])
+        return token.user, token
@@ -0,0 +1,91 @@
+import threading
+from bisect import bisect_left
+
+from recipes.models import Ingredient
+
+from .cache import INGREDIENTS_VERSION_KEY, bump_version, get_table_version
+
+AUTOCOMPLETE_LIMIT = 50
+
+
+def sort_key(ingredient):
+    return ingredient.name.lower(), ingredient.measurement_unit
+
+
+def search_ingredients(query, limit=AUTOCOMPLETE_LIMIT):
+    """То же, что IngredientIndex.search, но запросами к БД.
+
+    Совпадения по началу названия идут первыми, вхождения в середину
+    ищутся, только если первых меньше limit.
+    """
+    query = query.strip()
+    ingredients = Ingredient.objects.only('id', 'name', 'measurement_unit')
+    result = sorted(
+        ingredients.filter(name__istartswith=query), key=sort_key
+    )[:limit]
+    if len(result) < limit:
+        result += sorted(
+            ingredients.filter(name__icontains=query).exclude(
+                name__istartswith=query
+            ),
+            key=sort_key
+        )[:limit - len(result)]
+    return result
+
+
+class IngredientIndex:
+    """Отсортированный по названию индекс ингредиентов в памяти процесса.
+
+    Индекс перестраивается, когда меняется версия ингредиентов,
+    см. get_table_version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._keys = []
+        self._ingredients = []
+
+    def build(self):
+        version = self.get_version()
+        ingredients = sorted(
+            Ingredient.objects.only('id', 'name', 'measurement_unit'),
+            key=sort_key
+        )
+        keys = [ingredient.name.lower() for ingredient in ingredients]
+        with self._lock:
+            self._keys, self._ingredients = keys, ingredients
+            self._version = version
+
+    def get_version(self):
+        return get_table_version(INGREDIENTS_VERSION_KEY, Ingredient)
+
+    def invalidate(self):
+        bump_version(INGREDIENTS_VERSION_KEY)
+
+    def _entries(self):
+        if self._version != self.get_version():
+            self.build()
+        with self._lock:
+            return self._keys, self._ingredients
+
+    def search(self, query, limit=AUTOCOMPLETE_LIMIT):
+        query = query.strip().lower()
+        keys, ingredients = self._entries()
+        if not query:
+            return ingredients[:limit]
+        start = bisect_left(keys, query)
+        end = start
+        while end < len(keys) and keys[end].startswith(query):
+            end += 1
+        result = ingredients[start:min(end, start + limit)]
+        if len(result) < limit:
+            for position, key in enumerate(keys):
+                if query in key and not start <= position < end:
+                    result.append(ingredients[position])
+                    if len(result) == limit:
+                        break
+        return result
+
+
+ingredient_index = IngredientIndex()
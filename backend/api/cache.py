@@ -0,0 +1,113 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .pdf import shopping_list_pdf
+from .services import get_shopping_list
+
+SHOPPING_LIST_TIMEOUT = 60 * 60 * 24
+TABLE_CHECK_INTERVAL = 30
+TAGS_VERSION_KEY = 'tags_version'
+INGREDIENTS_VERSION_KEY = 'ingredients_version'
+AUTH_VERSION_KEY = 'auth_version:{user_id}'
+SHOPPING_LIST_VERSION_KEY = 'shopping_list_version:{user_id}'
+LIST_KEY = 'shopping_list:{user_id}:{version}'
+PDF_KEY = 'shopping_list_pdf:{user_id}:{version}'
+
+
+def get_version(key):
+    # Версия - это время изменения данных в наносекундах. Она растет
+    # и после вытеснения ключа из кэша, поэтому старые записи не всплывут,
+    # а сама версия годится для заголовка Last-Modified.
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    cache.set(key, time.time_ns(), None)
+
+
+def get_table_version(key, model):
+    """Версия справочника, которая замечает и изменения из других процессов.
+
+    Сигналы сдвигают версию сразу, но LocMemCache у каждого процесса свой,
+    и bump_version из load_database или import_data до сервера не дойдет.
+    Поэтому раз в TABLE_CHECK_INTERVAL секунд версия сверяется с числом
+    строк и максимальным id таблицы. Правки существующих строк из другого
+    процесса так не видны, для них нужен общий кэш (CACHE_BACKEND).
+    """
+    checked_key = f'{key}:checked'
+    if cache.get(checked_key) is None:
+        summary = model.objects.aggregate(count=Count('pk'), last=Max('pk'))
+        summary_key = f'{key}:summary'
+        if cache.get(summary_key) != summary:
+            bump_version(key)
+            cache.set(summary_key, summary, None)
+        cache.set(checked_key, True, TABLE_CHECK_INTERVAL)
+    return get_version(key)
+
+
+# Версию списка покупок сдвигают сигналы того процесса, где изменилась
+# корзина. С LocMemCache другие воркеры этого не увидят, поэтому при
+# нескольких воркерах нужен общий CACHE_BACKEND (см. README).
+def get_shopping_list_version(user_id):
+    return get_version(SHOPPING_LIST_VERSION_KEY.format(user_id=user_id))
+
+
+def bump_shopping_list_version(*user_ids):
+    for user_id in user_ids:
+        bump_version(SHOPPING_LIST_VERSION_KEY.format(user_id=user_id))
+
+
+def invalidate_shopping_lists(user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        transaction.on_commit(
+            lambda: bump_shopping_list_version(*user_ids)
+        )
+
+
+def get_auth_version(user_id):
+    return get_version(AUTH_VERSION_KEY.format(user_id=user_id))
+
+
+def invalidate_tokens(user_id):
+    transaction.on_commit(
+        lambda: bump_version(AUTH_VERSION_KEY.format(user_id=user_id))
+    )
+
+
+def _get_or_set(key, default):
+    value = cache.get(key)
+    if value is None:
+        value = default()
+        cache.set(key, value, SHOPPING_LIST_TIMEOUT)
+    return value
+
+
+def get_cached_shopping_list(user, version=None):
+    if version is None:
+        version = get_shopping_list_version(user.id)
+    return _get_or_set(
+        LIST_KEY.format(user_id=user.id, version=version),
+        lambda: get_shopping_list(user)
+    )
+
+
+def get_cached_shopping_list_pdf(user):
+    version = get_shopping_list_version(user.id)
+
+    def render():
+        with shopping_list_pdf(
+            get_cached_shopping_list(user, version)
+        ) as stream:
+            return stream.read()
+
+    return _get_or_set(
+        PDF_KEY.format(user_id=user.id, version=version), render
+    )
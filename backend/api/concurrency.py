@@ -0,0 +1,48 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_THREADS, thread_name_prefix='api'
+)
+
+
+def call_in_thread(func, *args, **kwargs):
+    # Поток пула живет дольше запроса, поэтому соединение с БД
+    # обслуживается так же, как в начале и в конце обычного запроса.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_pool(func, *args, **kwargs):
+    """Выполняет синхронный код в ограниченном пуле потоков."""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        executor,
+        functools.partial(
+            context.run, call_in_thread, func, *args, **kwargs
+        )
+    )
+
+
+def offload(view):
+    """Делает из синхронного view асинхронное.
+
+    Сам view и отрисовка ответа DRF выполняются в пуле, а не в единственном
+    потоке, куда Django под ASGI отправляет синхронные view.
+    """
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        response = await run_in_pool(view, request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response = await run_in_pool(response.render)
+        return response
+
+    return async_view
@@ -0,0 +1,46 @@
+import csv
+import json
+
+from .pdf import TITLE
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def shopping_list_txt(items):
+    yield f'{TITLE}\n'
+    for item in items:
+        yield f'{item}\n'
+
+
+def shopping_list_csv(items):
+    writer = csv.writer(Echo())
+    yield writer.writerow(('name', 'measurement_unit', 'amount'))
+    for item in items:
+        yield writer.writerow(
+            (item.name, item.measurement_unit, item.amount)
+        )
+
+
+def shopping_list_json(items):
+    yield '['
+    for number, item in enumerate(items):
+        separator = ', ' if number else ''
+        yield separator + json.dumps(
+            {
+                'name': item.name,
+                'measurement_unit': item.measurement_unit,
+                'amount': item.amount,
+            },
+            ensure_ascii=False
+        )
+    yield ']'
+
+
+EXPORTERS = {
+    'txt': shopping_list_txt,
+    'csv': shopping_list_csv,
+    'json': shopping_list_json,
+}
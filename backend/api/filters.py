@@ -1,17 +1,72 @@
+from django import forms
+from django.db.models import Exists, OuterRef
 from django_filters.rest_framework import FilterSet, filters
-from recipes.models import Ingredient, Recipe
+from recipes.models import Favorite, Recipe, ShoppingCart, TagInRecipe
+from recipes.search import search_recipes
+
+
+class SlugsField(forms.MultipleChoiceField):
+
+    def valid_value(self, value):
+        return True
+
+
+class SlugsFilter(filters.MultipleChoiceFilter):
+    field_class = SlugsField
+
+
+class StableOrderingFilter(filters.OrderingFilter):
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        ordering = [self.get_ordering_value(param) for param in value]
+        return qs.order_by(*ordering, '-pub_date', '-id')
 
 
 class RecipeFilter(FilterSet):
+    tags = SlugsFilter(method='filter_tags')
+    is_favorited = filters.NumberFilter(method='filter_is_favorited')
+    is_in_shopping_cart = filters.NumberFilter(
+        method='filter_is_in_shopping_cart'
+    )
+    # Сортирует по релевантности, явный ordering идет после и заменяет ее.
+    search = filters.CharFilter(method='filter_search')
+    ordering = StableOrderingFilter(
+        fields=('pub_date', 'favorites_count', 'in_carts_count')
+    )
 
     class Meta:
         model = Recipe
-        fields = ('author', )
+        fields = ('author', 'tags', 'is_favorited', 'is_in_shopping_cart')
 
+    def filter_tags(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(Exists(TagInRecipe.objects.filter(
+            recipe=OuterRef('pk'), tags__slug__in=value
+        )))
 
-class IngredientFilter(FilterSet):
-    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    def filter_user_relation(self, queryset, model, value):
+        if value != 1:
+            return queryset
+        user = self.request.user
+        if user.is_anonymous:
+            return queryset.none()
+        return queryset.filter(
+            id__in=model.objects.filter(user=user).values('recipe_id')
+        )
 
-    class Meta:
-        model = Ingredient
-        fields = ('name',)
+    def filter_is_favorited(self, queryset, name, value):
+        return self.filter_user_relation(queryset, Favorite, value)
+
+    def filter_is_in_shopping_cart(self, queryset, name, value):
+        return self.filter_user_relation(queryset, ShoppingCart, value)
+
+    def filter_search(self, queryset, name, value):
+        value = value.strip()
+        if not value:
+            return queryset
+        return search_recipes(queryset, value).order_by(
+            '-search_rank', '-pub_date', '-id'
+        )
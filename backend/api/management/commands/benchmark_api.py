@@ -0,0 +1,198 @@
+import json
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from recipes.models import Ingredient, Recipe, Tag
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+IMAGE = (
+    'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABAgMAAABieywaAAAA'
+    'CVBMVEUAAAD///9fX1/S0ecCAAAACXBIWXMAAA7EAAAOxAGVKw4bAAAACklEQVQImWNoAA'
+    'AAggCByxOyYQAAAABJRU5ErkJggg=='
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет основные эндпоинты через тестовый клиент и сохраняет '
+        'время, число запросов к БД и выделения памяти в JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--output', default='benchmark_results.json',
+            help='Куда сохранить результаты'
+        )
+        parser.add_argument(
+            '--compare', help='Файл с результатами прошлого прогона'
+        )
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кэш перед каждым запросом'
+        )
+
+    def get_user(self):
+        user = User.objects.annotate(
+            carts=Count('shopping_cart')
+        ).order_by('-carts', 'id').first()
+        if user is None:
+            raise CommandError(
+                'База пуста, сначала выполните generate_data'
+            )
+        return user
+
+    def get_cases(self):
+        recipe = Recipe.objects.first()
+        tags = list(Tag.objects.values_list('slug', flat=True)[:2])
+        ingredient = Ingredient.objects.order_by('id').first()
+        tag_query = '&'.join(f'tags={slug}' for slug in tags)
+        return [
+            ('recipe_list', 'get', '/api/recipes/', None),
+            ('recipe_list_tags', 'get', f'/api/recipes/?{tag_query}', None),
+            (
+                'recipe_list_favorited', 'get',
+                '/api/recipes/?is_favorited=1', None
+            ),
+            (
+                'recipe_list_cursor', 'get',
+                '/api/recipes/?pagination=cursor', None
+            ),
+            ('recipe_detail', 'get', f'/api/recipes/{recipe.id}/', None),
+            (
+                'subscriptions', 'get',
+                '/api/users/subscriptions/?recipes_limit=3', None
+            ),
+            (
+                'ingredient_search', 'get',
+                f'/api/ingredients/?name={ingredient.name[:2]}', None
+            ),
+            (
+                'download_shopping_cart_pdf', 'get',
+                '/api/recipes/download_shopping_cart/', None
+            ),
+            (
+                'download_shopping_cart_txt', 'get',
+                '/api/recipes/download_shopping_cart/?format=txt', None
+            ),
+            ('recipe_create', 'post', '/api/recipes/', {
+                'name': 'Рецепт для бенчмарка',
+                'text': 'Текст',
+                'cooking_time': 10,
+                'image': IMAGE,
+                'tags': list(Tag.objects.values_list('id', flat=True)[:2]),
+                'ingredients': [
+                    {'id': pk, 'amount': 10} for pk in
+                    Ingredient.objects.values_list('id', flat=True)[:10]
+                ],
+            }),
+        ]
+
+    def request(self, client, method, url, payload):
+        if payload is None:
+            response = getattr(client, method)(url)
+        else:
+            response = getattr(client, method)(
+                url, json.dumps(payload), content_type='application/json'
+            )
+        if response.streaming:
+            b''.join(response.streaming_content)
+        if method == 'post' and response.status_code == 201:
+            recipe = Recipe.objects.get(id=response.json()['id'])
+            recipe.image.delete(save=False)
+            recipe.delete()
+        return response
+
+    def run_case(self, client, method, url, payload, repeat, cold):
+        timings = []
+        queries = []
+        status = None
+        for _ in range(repeat):
+            if cold:
+                cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = self.request(client, method, url, payload)
+                timings.append((time.perf_counter() - start) * 1000)
+            status = response.status_code
+            queries.append(len(context.captured_queries))
+        if cold:
+            cache.clear()
+        tracemalloc.start()
+        self.request(client, method, url, payload)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings.sort()
+        return {
+            'status': status,
+            'latency_ms': {
+                'min': round(timings[0], 3),
+                'median': round(statistics.median(timings), 3),
+                'p95': round(timings[int(0.95 * (len(timings) - 1))], 3),
+            },
+            'queries': statistics.median(queries),
+            'peak_alloc_kb': round(peak / 1024, 1),
+        }
+
+    def compare(self, results, path):
+        with open(path, encoding='utf-8') as file:
+            previous = json.load(file)['results']
+        for name, result in results.items():
+            if name not in previous:
+                continue
+            before = previous[name]['latency_ms']['median']
+            after = result['latency_ms']['median']
+            self.stdout.write(
+                f'{name:>28}: {before:9.2f} -> {after:9.2f} мс, '
+                f'запросов {previous[name]["queries"]} -> '
+                f'{result["queries"]}'
+            )
+
+    def handle(self, *args, **options):
+        user = self.get_user()
+        token, _ = Token.objects.get_or_create(user=user)
+        client = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+        results = {}
+        for name, method, url, payload in self.get_cases():
+            result = self.run_case(
+                client, method, url, payload,
+                options['repeat'], options['cold']
+            )
+            results[name] = dict(result, method=method.upper(), url=url)
+            self.stdout.write(
+                f'{name:>28}: {result["status"]} | '
+                f'median {result["latency_ms"]["median"]:8.2f} мс | '
+                f'p95 {result["latency_ms"]["p95"]:8.2f} мс | '
+                f'запросов {result["queries"]:>5} | '
+                f'память {result["peak_alloc_kb"]:9.1f} КБ'
+            )
+        report = {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'repeat': options['repeat'],
+                'cold': options['cold'],
+                'users': User.objects.count(),
+                'recipes': Recipe.objects.count(),
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Результаты сохранены в {options["output"]}'
+        ))
+        if options['compare']:
+            self.compare(results, options['compare'])
@@ -0,0 +1,41 @@
+import time
+
+from api.autocomplete import ingredient_index, search_ingredients
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает поиск ингредиентов запросами к БД и через индекс'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queries', nargs='+',
+            default=['м', 'мо', 'мол', 'молоко', 'сыр', 'ко', 'а']
+        )
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def measure(self, search, query, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = search(query)
+        return (time.perf_counter() - start) / repeat * 1000, len(result)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        ingredient_index.build()
+        self.stdout.write(
+            f'Построение индекса: '
+            f'{(time.perf_counter() - start) * 1000:.1f} мс'
+        )
+        for query in options['queries']:
+            db_time, db_count = self.measure(
+                search_ingredients, query, options['repeat']
+            )
+            index_time, index_count = self.measure(
+                ingredient_index.search, query, options['repeat']
+            )
+            self.stdout.write(
+                f'{query!r:>10}: БД {db_time:.3f} мс '
+                f'({db_count}), индекс {index_time:.3f} мс '
+                f'({index_count})'
+            )
@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+MODES = {
+    'new_connection': {
+        'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'POOL_SIZE': 0
+    },
+    'persistent': {
+        'CONN_MAX_AGE': None, 'CONN_HEALTH_CHECKS': False, 'POOL_SIZE': 0
+    },
+    'persistent_health_checks': {
+        'CONN_MAX_AGE': None, 'CONN_HEALTH_CHECKS': True, 'POOL_SIZE': 0
+    },
+    'pool': {
+        'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'POOL_SIZE': 4
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет накладные расходы на соединение с БД для короткого '
+        'запроса при разных настройках CONN_MAX_AGE и пула'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500)
+
+    def run_mode(self, settings, iterations):
+        connection.close()
+        saved = {key: connection.settings_dict.get(key) for key in settings}
+        connection.settings_dict.update(settings)
+        created = []
+
+        def count(**kwargs):
+            created.append(1)
+
+        connection_created.connect(count, dispatch_uid='benchmark')
+        timings = []
+        try:
+            for _ in range(iterations):
+                start = time.perf_counter()
+                # Тот же цикл, что у настоящего запроса: сигналы вызывают
+                # close_old_connections в начале и в конце.
+                request_started.send(sender=WSGIHandler)
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                request_finished.send(sender=WSGIHandler)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection_created.disconnect(dispatch_uid='benchmark')
+            connection.close()
+            connection.settings_dict.update(saved)
+        timings.sort()
+        return {
+            'median': statistics.median(timings),
+            'p95': timings[int(0.95 * (len(timings) - 1))],
+            'connections': len(created),
+        }
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{connection.vendor}, {connection.settings_dict["ENGINE"]}'
+        )
+        for name, settings in MODES.items():
+            if settings['POOL_SIZE'] and not hasattr(connection, 'pool_size'):
+                self.stdout.write(f'{name:>26}: бэкенд не поддерживает пул')
+                continue
+            result = self.run_mode(settings, options['iterations'])
+            self.stdout.write(
+                f'{name:>26}: median {result["median"]:8.3f} мс | '
+                f'p95 {result["p95"]:8.3f} мс | '
+                f'подключений {result["connections"]}'
+            )
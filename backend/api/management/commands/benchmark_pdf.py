@@ -0,0 +1,36 @@
+import time
+
+from api.pdf import shopping_list_pdf
+from api.services import ShoppingListItem
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время генерации PDF списка покупок'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int,
+            default=[10, 100, 1000, 10000]
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            items = [
+                ShoppingListItem(
+                    name=f'Ингредиент {number}',
+                    measurement_unit='г',
+                    amount=number
+                ) for number in range(size)
+            ]
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                shopping_list_pdf(items).close()
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(
+                f'{size:>6} позиций: '
+                f'min {min(timings) * 1000:.1f} мс, '
+                f'avg {sum(timings) / len(timings) * 1000:.1f} мс'
+            )
@@ -0,0 +1,75 @@
+import time
+from types import SimpleNamespace
+
+from api.filters import RecipeFilter
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from recipes.models import Recipe, Tag
+
+User = get_user_model()
+PAGE_SIZE = 6
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает фильтрацию рецептов через JOIN + DISTINCT '
+        'и через EXISTS на текущих данных'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--page', type=int, default=1)
+
+    def measure(self, get_result, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            get_result()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def legacy_queryset(self, user, params):
+        queryset = Recipe.objects.all()
+        if params.get('tags'):
+            queryset = queryset.filter(
+                tags__slug__in=params['tags']
+            ).distinct()
+        if params.get('is_favorited') == 1:
+            queryset = queryset.filter(favorite__user=user)
+        if params.get('is_in_shopping_cart') == 1:
+            queryset = queryset.filter(shopping_cart__user=user)
+        return queryset
+
+    def exists_queryset(self, user, params):
+        return RecipeFilter(
+            params,
+            queryset=Recipe.objects.all(),
+            request=SimpleNamespace(user=user)
+        ).qs
+
+    def handle(self, *args, **options):
+        user = User.objects.order_by('id').first()
+        tags = list(Tag.objects.values_list('slug', flat=True)[:2])
+        cases = {
+            'tags': {'tags': tags},
+            'tags + is_favorited': {'tags': tags, 'is_favorited': 1},
+            'is_in_shopping_cart': {'is_in_shopping_cart': 1},
+        }
+        offset = (options['page'] - 1) * PAGE_SIZE
+        self.stdout.write(f'Рецептов: {Recipe.objects.count()}')
+        for title, params in cases.items():
+            for name, build in (
+                ('JOIN + DISTINCT', self.legacy_queryset),
+                ('EXISTS / IN', self.exists_queryset),
+            ):
+                queryset = build(user, params)
+                page_time = self.measure(
+                    lambda: list(queryset.all()[offset:offset + PAGE_SIZE]),
+                    options['repeat']
+                )
+                count_time = self.measure(
+                    lambda: queryset.all().count(), options['repeat']
+                )
+                self.stdout.write(
+                    f'{title:>20} | {name:>15} | '
+                    f'страница {page_time:8.2f} мс | '
+                    f'count {count_time:8.2f} мс'
+                )
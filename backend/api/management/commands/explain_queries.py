@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from api.filters import RecipeFilter
+from api.services import shopping_list_queryset
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from recipes.models import Favorite, Recipe, ShoppingCart, Tag
+from users.models import Follow
+
+User = get_user_model()
+PAGE_SIZE = 6
+
+
+class Command(BaseCommand):
+    help = 'Печатает планы EXPLAIN для самых частых запросов API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help='id пользователя')
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='EXPLAIN ANALYZE (только PostgreSQL)'
+        )
+
+    def filter_recipes(self, user, **params):
+        return RecipeFilter(
+            params,
+            queryset=Recipe.objects.all(),
+            request=SimpleNamespace(user=user)
+        ).qs[:PAGE_SIZE]
+
+    def get_queries(self, user):
+        tags = list(Tag.objects.values_list('slug', flat=True)[:2])
+        return {
+            'Лента рецептов': Recipe.objects.all()[:PAGE_SIZE],
+            'Рецепты автора': Recipe.objects.filter(
+                author=user
+            )[:PAGE_SIZE],
+            'Рецепты по тегам': self.filter_recipes(user, tags=tags),
+            'Избранные рецепты': self.filter_recipes(
+                user, is_favorited=1
+            ),
+            'Рецепты в корзине': self.filter_recipes(
+                user, is_in_shopping_cart=1
+            ),
+            'Список избранного': Favorite.objects.filter(user=user),
+            'Корзина': ShoppingCart.objects.filter(user=user),
+            'Подписки': Follow.objects.filter(user=user),
+            'Список покупок': shopping_list_queryset(user),
+        }
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['user'] is not None:
+            users = users.filter(id=options['user'])
+        user = users.first()
+        if user is None:
+            raise CommandError('Нет пользователя для построения запросов')
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze доступен только в PostgreSQL')
+            explain_options = {'analyze': True, 'buffers': True}
+        for title, queryset in self.get_queries(user).items():
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write('')
@@ -0,0 +1,118 @@
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+PATHS = (
+    '/api/recipes/',
+    '/api/recipes/?pagination=cursor',
+    '/api/tags/',
+    '/api/ingredients/?name=ма',
+    '/api/recipes/download_shopping_cart/',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест запущенного сервера: считает пропускную '
+        'способность и задержки, чтобы сравнить WSGI и ASGI'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--token', help='Токен для авторизации')
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument(
+            '--duration', type=float, default=10, help='Секунды'
+        )
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Путь для нагрузки, можно указать несколько раз'
+        )
+        parser.add_argument('--output', help='Куда сохранить результаты')
+        parser.add_argument(
+            '--compare', help='Файл с результатами прошлого прогона'
+        )
+
+    def worker(self, urls, headers, deadline, results, lock):
+        samples = []
+        for url in urls:
+            if time.monotonic() >= deadline:
+                break
+            start = time.perf_counter()
+            try:
+                with urlopen(Request(url, headers=headers)) as response:
+                    response.read()
+                    status = response.status
+            except HTTPError as error:
+                status = error.code
+            except URLError:
+                status = 0
+            samples.append((status, time.perf_counter() - start))
+        with lock:
+            results.extend(samples)
+
+    def handle(self, *args, **options):
+        paths = list(options['paths'] or PATHS)
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Token {options["token"]}'
+        results = []
+        lock = threading.Lock()
+        concurrency = options['concurrency']
+        started = time.monotonic()
+        deadline = started + options['duration']
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = []
+            for number in range(concurrency):
+                # Потоки начинают с разных путей, чтобы нагрузка
+                # распределялась по эндпоинтам равномерно.
+                urls = cycle([
+                    options['url'] + quote(path, safe='/?=&')
+                    for path in paths[number % len(paths):] + paths
+                ])
+                futures.append(executor.submit(
+                    self.worker, urls, headers, deadline, results, lock
+                ))
+            for future in futures:
+                future.result()
+        elapsed = time.monotonic() - started
+        latencies = sorted(latency * 1000 for _, latency in results)
+        errors = sum(1 for status, _ in results if not 200 <= status < 300)
+        report = {
+            'meta': {
+                'created': timezone.now().isoformat(),
+                'url': options['url'],
+                'concurrency': concurrency,
+                'duration': options['duration'],
+                'paths': list(paths),
+            },
+            'requests': len(results),
+            'errors': errors,
+            'rps': round(len(results) / elapsed, 1),
+            'latency_ms': {
+                'median': round(statistics.median(latencies), 2),
+                'p95': round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+                'max': round(latencies[-1], 2),
+            } if latencies else None,
+        }
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                previous = json.load(file)
+            self.stdout.write(
+                f'rps: {previous["rps"]} -> {report["rps"]}, '
+                f'p95: {previous["latency_ms"]["p95"]} -> '
+                f'{report["latency_ms"]["p95"]} мс'
+            )
@@ -0,0 +1,110 @@
+import threading
+from collections import deque
+
+SAMPLE_SIZE = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+SERIES = (
+    (
+        'foodgram_request_duration_seconds',
+        'Время обработки запроса',
+        'duration'
+    ),
+    (
+        'foodgram_db_queries',
+        'Число запросов к БД на один запрос',
+        'queries'
+    ),
+    (
+        'foodgram_db_duration_seconds',
+        'Время запросов к БД на один запрос',
+        'db_duration'
+    ),
+)
+
+
+class RouteStats:
+    """Последние SAMPLE_SIZE замеров маршрута плюс накопленные суммы."""
+
+    def __init__(self):
+        self.count = 0
+        self.sums = {'duration': 0, 'queries': 0, 'db_duration': 0}
+        self.samples = {
+            name: deque(maxlen=SAMPLE_SIZE) for name in self.sums
+        }
+
+    def add(self, **values):
+        self.count += 1
+        for name, value in values.items():
+            self.sums[name] += value
+            self.samples[name].append(value)
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, method, route, duration, queries, db_duration):
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.add(
+                duration=duration, queries=queries, db_duration=db_duration
+            )
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: (
+                    stats.count,
+                    dict(stats.sums),
+                    {
+                        name: sorted(samples)
+                        for name, samples in stats.samples.items()
+                    }
+                )
+                for key, stats in self._routes.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+def quantile(values, q):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def escape_label(value):
+    return (
+        value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+    )
+
+
+def render_prometheus(snapshot):
+    lines = []
+    for metric, description, name in SERIES:
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} summary')
+        for (method, route), (count, sums, samples) in sorted(
+            snapshot.items()
+        ):
+            labels = (
+                f'method="{escape_label(method)}",'
+                f'route="{escape_label(route)}"'
+            )
+            for q in QUANTILES:
+                lines.append(
+                    f'{metric}{{{labels},quantile="{q}"}} '
+                    f'{quantile(samples[name], q)}'
+                )
+            lines.append(f'{metric}_sum{{{labels}}} {sums[name]}')
+            lines.append(f'{metric}_count{{{labels}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
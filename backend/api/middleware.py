@@ -0,0 +1,92 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+from .metrics import registry
+
+current_timer = ContextVar('current_timer', default=None)
+
+
+class QueryTimer:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def timed_execute(execute, sql, params, many, context):
+    """Обертка для всех соединений: считает запрос таймеру из контекста.
+
+    Контекст переходит в потоки sync_to_async и api.concurrency, поэтому
+    запросы учитываются в любом потоке, где выполняется view.
+    """
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_timer(sender, connection, **kwargs):
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+class MetricsMiddleware:
+    """Замеряет время запроса, число и время запросов к БД.
+
+    Итоги уходят в заголовок Server-Timing и в registry,
+    откуда их забирает эндпоинт метрик.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так же, как MiddlewareMixin, помечаем экземпляр корутиной.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.finish(request, response, timer, start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        return self.finish(request, response, timer, start)
+
+    def finish(self, request, response, timer, start):
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        route = match.route if match is not None else 'unmatched'
+        registry.observe(
+            request.method, route, duration, timer.count, timer.duration
+        )
+        response['Server-Timing'] = (
+            f'db;dur={timer.duration * 1000:.1f};'
+            f'desc="{timer.count} queries", '
+            f'total;dur={duration * 1000:.1f}'
+        )
+        return response
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .cache import get_table_version
+
+
+class CachedReadMixin:
+    """Отдает list и retrieve из кэша с версией и поддержкой ETag.
+
+    Версию меняют сигналы моделей и сверка с таблицей
+    (см. get_table_version), поэтому сериализованные данные живут
+    в кэше до первого изменения справочника.
+    """
+    cache_version_key = None
+    cache_timeout = 60 * 60 * 24
+
+    def cached_response(self, request, get_data):
+        version = get_table_version(
+            self.cache_version_key, self.queryset.model
+        )
+        etag = quote_etag(str(version))
+        last_modified = version // 10 ** 9
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            key = (
+                f'{self.cache_version_key}:{version}:'
+                f'{request.get_full_path()}'
+            )
+            data = cache.get(key)
+            if data is None:
+                data = get_data()
+                cache.set(key, data, self.cache_timeout)
+            response = Response(data)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CachedReadMixin, self).list(
+                request, *args, **kwargs
+            ).data
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(CachedReadMixin, self).retrieve(
+                request, *args, **kwargs
+            ).data
+        )
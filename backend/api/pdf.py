@@ -0,0 +1,56 @@
+import tempfile
+from os import path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+FONT_NAME = 'Roboto'
+FONT_PATH = path.join(
+    path.realpath(path.dirname(__file__)), 'fonts/Roboto-Italic.ttf'
+)
+TITLE = 'Ваш список покупок сформирован Foodgram:'
+TITLE_FONT_SIZE = 14
+ITEM_FONT_SIZE = 12
+LINE_HEIGHT = 15
+MARGIN = 0.4 * inch
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def register_fonts():
+    if FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(FONT_NAME, FONT_PATH))
+
+
+def render_shopping_list(items, stream, pagesize=A4):
+    register_fonts()
+    width, height = pagesize
+    top = height - MARGIN - TITLE_FONT_SIZE
+    p = canvas.Canvas(stream, pagesize=pagesize)
+    p.setFont(FONT_NAME, TITLE_FONT_SIZE)
+    p.drawString(MARGIN, top, TITLE)
+    p.setFont(FONT_NAME, ITEM_FONT_SIZE)
+    y = top - 25
+    for item in items:
+        if y < MARGIN:
+            p.showPage()
+            p.setFont(FONT_NAME, ITEM_FONT_SIZE)
+            y = top
+        p.drawString(MARGIN + 15, y, str(item))
+        y -= LINE_HEIGHT
+    p.showPage()
+    p.save()
+    return stream
+
+
+def shopping_list_pdf(items):
+    """Возвращает файл с PDF, готовый к отдаче через FileResponse.
+
+    Небольшие документы остаются в памяти, крупные уходят на диск.
+    """
+    stream = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    render_shopping_list(items, stream)
+    stream.seek(0)
+    return stream
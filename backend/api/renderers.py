@@ -0,0 +1,39 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+ERROR_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+class ShoppingListRenderer(BaseRenderer):
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Список покупок отдается потоком прямо из представления,
+        # через рендерер проходят только ответы с ошибками. Они в JSON
+        # при любом запрошенном формате, и тип ответа должен это отражать.
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = ERROR_CONTENT_TYPE
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class PDFRenderer(ShoppingListRenderer):
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+
+
+class PlainTextRenderer(ShoppingListRenderer):
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+class CSVRenderer(ShoppingListRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class JSONRenderer(ShoppingListRenderer):
+    media_type = 'application/json'
+    format = 'json'
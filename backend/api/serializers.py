@@ -1,6 +1,11 @@
+from django.core.files.storage import default_storage
+from django.db import transaction
 from drf_extra_fields.fields import Base64ImageField
+from recipes.counters import raw_delete
 from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
                             ShoppingCart, Tag, TagInRecipe)
+from recipes.thumbnails import (THUMBNAIL_FORMATS, THUMBNAIL_SIZES,
+                                schedule_thumbnails, thumbnail_name)
 from rest_framework import serializers
 from users.custom_user import UserSerializer
 from users.models import User
@@ -37,9 +42,7 @@ class IngredientInRecipeSerializer(serializers.ModelSerializer):
 
 
 class CreateIngredientRecipeSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all()
-    )
+    id = serializers.IntegerField()
 
     class Meta:
         model = IngredientInRecipe
@@ -57,45 +60,140 @@ class CreateRecipeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Recipe
-        fields = '__all__'
+        fields = (
+            'id',
+            'tags',
+            'ingredients',
+            'image',
+            'author',
+            'cooking_time',
+            'name',
+            'text',
+            'pub_date',
+        )
 
+    def validate_ingredients(self, value):
+        ids = [ingredient['id'] for ingredient in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(
+                'Ингредиенты не должны повторяться'
+            )
+        if Ingredient.objects.filter(id__in=ids).count() != len(ids):
+            raise serializers.ValidationError(
+                'Указан несуществующий ингредиент'
+            )
+        return value
+
+    def set_ingredients(self, recipe, ingredients, created=False):
+        amounts = {
+            ingredient['id']: ingredient['amount']
+            for ingredient in ingredients
+        }
+        existing = {}
+        if not created:
+            existing = {
+                row.ingredient_id: row
+                for row in IngredientInRecipe.objects.filter(recipe=recipe)
+            }
+        removed = [
+            row.id for ingredient_id, row in existing.items()
+            if ingredient_id not in amounts
+        ]
+        changed = []
+        for ingredient_id, amount in amounts.items():
+            row = existing.get(ingredient_id)
+            if row is not None and row.amount != amount:
+                row.amount = amount
+                changed.append(row)
+        if removed:
+            # Кэши списков покупок сбросит сохранение рецепта.
+            raw_delete(IngredientInRecipe.objects.filter(id__in=removed))
+        if changed:
+            IngredientInRecipe.objects.bulk_update(changed, ['amount'])
+        IngredientInRecipe.objects.bulk_create([
+            IngredientInRecipe(
+                recipe=recipe, ingredient_id=ingredient_id, amount=amount
+            )
+            for ingredient_id, amount in amounts.items()
+            if ingredient_id not in existing
+        ])
+
+    def set_tags(self, recipe, tags, created=False):
+        tag_ids = {tag.id for tag in tags}
+        existing = set()
+        if not created:
+            existing = set(
+                TagInRecipe.objects.filter(recipe=recipe).values_list(
+                    'tags_id', flat=True
+                )
+            )
+        if existing - tag_ids:
+            TagInRecipe.objects.filter(
+                recipe=recipe, tags_id__in=existing - tag_ids
+            ).delete()
+        TagInRecipe.objects.bulk_create([
+            TagInRecipe(recipe=recipe, tags_id=tag_id)
+            for tag_id in tag_ids - existing
+        ])
+
+    @transaction.atomic
     def create(self, validated_data):
         tags = validated_data.pop('tags')
         ingredients = validated_data.pop('ingredients')
         user = self.context.get('request').user
         recipe = Recipe.objects.create(**validated_data, author=user)
-        for ingredient in ingredients:
-            ingredient_id = ingredient['id']
-            amount = ingredient['amount']
-            IngredientInRecipe.objects.create(
-                ingredient=ingredient_id, recipe=recipe, amount=amount
-            )
-        recipe.tags.set(tags)
+        self.set_ingredients(recipe, ingredients, created=True)
+        self.set_tags(recipe, tags, created=True)
+        schedule_thumbnails(recipe)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients')
         tags = validated_data.pop('tags')
-        TagInRecipe.objects.filter(recipe=instance).delete()
-        IngredientInRecipe.objects.filter(recipe=instance).delete()
-        for ingredient in ingredients:
-            ingredient_id = ingredient['id']
-            amount = ingredient['amount']
-            IngredientInRecipe.objects.create(
-                ingredient=ingredient_id, recipe=instance, amount=amount
-            )
+        self.set_ingredients(instance, ingredients)
+        self.set_tags(instance, tags)
         instance.name = validated_data.pop('name')
         instance.text = validated_data.pop('text')
-        if validated_data.get('image') is not None:
-            instance.image = validated_data.pop('image')
+        image = validated_data.pop('image', None)
+        if image is not None:
+            instance.image = image
+            instance.thumbnails_ready = False
         instance.cooking_time = validated_data.pop('cooking_time')
-        instance.tags.set(tags)
         instance.save()
+        if image is not None:
+            schedule_thumbnails(instance)
         return instance
 
 
+class ThumbnailsField(serializers.Field):
+    """Ссылки на превью картинки или None, пока они не готовы."""
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, recipe):
+        if not recipe.image or not recipe.thumbnails_ready:
+            return None
+        request = self.context.get('request')
+        thumbnails = {}
+        for size in THUMBNAIL_SIZES:
+            thumbnails[size] = {}
+            for extension in THUMBNAIL_FORMATS:
+                url = default_storage.url(
+                    thumbnail_name(recipe.image.name, size, extension)
+                )
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                thumbnails[size][extension] = url
+        return thumbnails
+
+
 class ReadRecipeSerializer(serializers.ModelSerializer):
     image = Base64ImageField()
+    thumbnails = ThumbnailsField()
     author = UserSerializer(read_only=True)
     ingredients = serializers.SerializerMethodField()
     tags = TagSerializer(read_only=True, many=True)
@@ -104,23 +202,42 @@ class ReadRecipeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Recipe
-        fields = '__all__'
+        fields = (
+            'id',
+            'image',
+            'thumbnails',
+            'author',
+            'ingredients',
+            'tags',
+            'is_favorited',
+            'is_in_shopping_cart',
+            'name',
+            'text',
+            'cooking_time',
+            'pub_date',
+        )
 
     def get_ingredients(self, obj):
-        ingredients = IngredientInRecipe.objects.filter(recipe=obj)
+        ingredients = obj.ingredient_amounts.all()
         return IngredientInRecipeSerializer(ingredients, many=True).data
 
     def get_is_favorited(self, obj):
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
+        if 'get_is_favorited' in self.context:
+            return obj.id in self.context['get_is_favorited']
         return Favorite.objects.filter(recipe=obj, user=request.user).exists()
 
     def get_is_in_shopping_cart(self, obj):
         request = self.context.get('request')
         if request is None or request.user.is_anonymous:
             return False
-        return obj.id in self.context['get_is_in_shopping_cart']
+        if 'get_is_in_shopping_cart' in self.context:
+            return obj.id in self.context['get_is_in_shopping_cart']
+        return ShoppingCart.objects.filter(
+            recipe=obj, user=request.user
+        ).exists()
 
 
 class FavoriteSerializer(serializers.ModelSerializer):
@@ -142,7 +259,16 @@ class ShoppingCartSerializer(FavoriteSerializer):
         fields = '__all__'
 
 
+class RecipeIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100
+    )
+
+
 class ShortRecipeSerializer(serializers.ModelSerializer):
+    thumbnails = ThumbnailsField()
 
     class Meta:
         model = Recipe
@@ -150,5 +276,6 @@ class ShortRecipeSerializer(serializers.ModelSerializer):
             'id',
             'name',
             'image',
+            'thumbnails',
             'cooking_time',
         )
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import List
+
+from django.db.models import Sum
+from recipes.models import IngredientInRecipe
+
+
+@dataclass(frozen=True)
+class ShoppingListItem:
+    name: str
+    measurement_unit: str
+    amount: int
+
+    def __str__(self):
+        return f'{self.name} - {self.amount} {self.measurement_unit}'
+
+
+def shopping_list_queryset(user):
+    return IngredientInRecipe.objects.filter(
+        recipe__shopping_cart__user=user
+    ).values(
+        'ingredient__name', 'ingredient__measurement_unit'
+    ).annotate(
+        total=Sum('amount')
+    ).order_by(
+        'ingredient__name', 'ingredient__measurement_unit'
+    )
+
+
+def get_shopping_list(user) -> List[ShoppingListItem]:
+    """Суммирует ингредиенты из корзины пользователя одним запросом.
+
+    Группировка идет по названию и единице измерения, поэтому
+    "Мука, г" и "Мука, кг" остаются разными позициями.
+    """
+    return [
+        ShoppingListItem(
+            name=row['ingredient__name'],
+            measurement_unit=row['ingredient__measurement_unit'],
+            amount=row['total'] or 0,
+        ) for row in shopping_list_queryset(user).iterator()
+    ]
@@ -1,22 +1,48 @@
-from django.urls import include, path
+from django.conf import settings
+from django.urls import URLPattern, include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (FavoriteListView, FavoriteView, IngredientsViewSet,
-                    RecipeViewSet, ShoppingCartView, TagViewSet,
-                    download_shopping_cart)
+from .concurrency import offload
+from .views import (FavoriteBatchView, FavoriteListView, FavoriteView,
+                    IngredientsViewSet, RecipeViewSet, ShoppingCartBatchView,
+                    ShoppingCartView, TagViewSet, download_shopping_cart,
+                    metrics)
+
+ASYNC_ROUTES = (
+    'recipes-list',
+    'recipes-detail',
+    'recipes-feed',
+    'tags-list',
+    'tags-detail',
+    'ingredients-list',
+    'ingredients-detail',
+)
 
 router = DefaultRouter()
 router.register(r'recipes', RecipeViewSet, basename='recipes')
 router.register(r'ingredients', IngredientsViewSet, basename='ingredients')
 router.register(r'tags', TagViewSet, basename='tags')
+router_urls = router.urls
+if settings.ASYNC_VIEWS:
+    router_urls = [
+        URLPattern(
+            url.pattern, offload(url.callback), url.default_args, url.name
+        ) if url.name in ASYNC_ROUTES else url
+        for url in router_urls
+    ]
+    download_shopping_cart = offload(download_shopping_cart)
+
 urlpatterns = [
     path(
         'recipes/download_shopping_cart/',
         download_shopping_cart,
         name='download_shopping_cart'
     ),
+    path('recipes/favorite/batch/', FavoriteBatchView.as_view()),
+    path('recipes/shopping_cart/batch/', ShoppingCartBatchView.as_view()),
     path('recipes/<int:recipe_id>/favorite/', FavoriteView.as_view()),
     path('favorites/', FavoriteListView.as_view()),
+    path('metrics/', metrics, name='metrics'),
     path('recipes/<int:recipe_id>/shopping_cart/', ShoppingCartView.as_view()),
-    path('', include(router.urls)),
+    path('', include(router_urls)),
 ]
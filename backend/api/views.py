@@ -1,149 +1,305 @@
 import io
-from os import path
 
-from django.http import FileResponse
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Prefetch
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
-                            ShoppingCart, Tag)
-from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
+from recipes.counters import change_counter, raw_delete, recount_locked_recipes
+from recipes.models import (Favorite, FeedItem, Ingredient, IngredientInRecipe,
+                            Recipe, ShoppingCart, Tag)
 from rest_framework import status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       renderer_classes)
 from rest_framework.generics import ListAPIView, get_object_or_404
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import (AllowAny, IsAdminUser, IsAuthenticated,
+                                        IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from users.models import Follow
 
-from .filters import IngredientFilter, RecipeFilter
+from .autocomplete import ingredient_index, search_ingredients
+from .cache import (INGREDIENTS_VERSION_KEY, TAGS_VERSION_KEY,
+                    get_cached_shopping_list, get_cached_shopping_list_pdf,
+                    invalidate_shopping_lists)
+from .exports import EXPORTERS
+from .filters import RecipeFilter
+from .metrics import registry, render_prometheus
+from .mixins import CachedReadMixin
+from .pagination import (OptInCursorOnlyPagination, OptInCursorPagination,
+                         PubDateCursorPagination)
+from .renderers import (CSVRenderer, JSONRenderer, PDFRenderer,
+                        PlainTextRenderer)
 from .serializers import (CreateRecipeSerializer, FavoriteSerializer,
                           IngredientSerializer, ReadRecipeSerializer,
-                          ShoppingCartSerializer, TagSerializer)
+                          RecipeIdsSerializer, TagSerializer)
 
 
 class RecipeViewSet(viewsets.ModelViewSet):
-    pagination_class = PageNumberPagination
+    pagination_class = OptInCursorPagination
+    # Релевантность и популярность курсор по дате потерял бы.
+    cursor_conflicting_params = ('search', 'ordering')
     filter_backends = [DjangoFilterBackend, ]
     filterset_class = RecipeFilter
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
     def get_queryset(self):
-        user = self.request.user
         queryset = Recipe.objects.all()
-        if self.request.query_params.getlist('tags'):
-            list = self.request.query_params.getlist('tags')
-            queryset = queryset.filter(tags__slug__in=list).distinct()
-        if self.request.query_params.get('is_favorited') == '1':
-            queryset = queryset.filter(favorite__user=user)
-        if self.request.query_params.get('is_in_shopping_cart') == '1':
-            queryset = queryset.filter(shopping_cart__user=user)
+        if self.action in ['list', 'retrieve', 'feed']:
+            queryset = queryset.select_related('author').prefetch_related(
+                'tags',
+                Prefetch(
+                    'ingredient_amounts',
+                    queryset=IngredientInRecipe.objects.select_related(
+                        'ingredient'
+                    )
+                )
+            )
         return queryset
 
     def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'feed']:
             return ReadRecipeSerializer
         return CreateRecipeSerializer
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
+        user = self.request.user
+        if (
+            self.action not in ['list', 'retrieve', 'feed']
+            or user.is_anonymous
+        ):
+            return context
         context.update(
             {
-                'request': self.request,
                 'get_is_favorited': set(
-                    Follow.objects.filter(
-                        user__id=self.request.user.id
-                    ).values_list(
-                        'following_id', flat=True
+                    Favorite.objects.filter(user=user).values_list(
+                        'recipe_id', flat=True
                     )
                 ),
                 'get_is_in_shopping_cart': set(
-                    ShoppingCart.objects.filter(
-                        user__id=self.request.user.id
-                    ).values_list(
+                    ShoppingCart.objects.filter(user=user).values_list(
                         'recipe_id', flat=True
                     )
                 ),
                 'subscriptions': set(
-                    Follow.objects.filter(
-                        user__id=self.request.user.id).values_list(
-                            'following_id', flat=True
+                    Follow.objects.filter(user=user).values_list(
+                        'following_id', flat=True
                     )
                 )
             }
         )
         return context
 
+    @action(
+        methods=['get'],
+        detail=False,
+        permission_classes=[IsAuthenticated],
+    )
+    def feed(self, request):
+        """Рецепты авторов из подписок, новые сначала.
+
+        Ленты заполняет recipes.feed. Тем, у кого мало подписок,
+        лента собирается из рецептов на лету.
+        """
+        user = request.user
+        paginator = PubDateCursorPagination()
+        follows = Follow.objects.filter(user=user)
+        if follows.count() <= settings.FEED_FANOUT_ON_READ_LIMIT:
+            recipes = paginator.paginate_queryset(
+                self.get_queryset().filter(
+                    author__in=follows.values('following_id')
+                ),
+                request,
+                view=self
+            )
+        else:
+            paginator.ordering = ('-pub_date', '-recipe')
+            items = paginator.paginate_queryset(
+                FeedItem.objects.filter(user=user), request, view=self
+            )
+            recipes = self.get_queryset().in_bulk(
+                [item.recipe_id for item in items]
+            )
+            recipes = [
+                recipes[item.recipe_id] for item in items
+                if item.recipe_id in recipes
+            ]
+        serializer = self.get_serializer(recipes, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
     permission_classes = (AllowAny, )
+    cache_version_key = TAGS_VERSION_KEY
 
 
-class IngredientsViewSet(viewsets.ModelViewSet):
+class IngredientsViewSet(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     pagination_class = None
-    filter_backends = [DjangoFilterBackend, ]
-    filterset_class = IngredientFilter
     search_fields = ['name', ]
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    cache_version_key = INGREDIENTS_VERSION_KEY
 
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get('name')
+        if name is None:
+            return super().list(request, *args, **kwargs)
+        # Без индекса в памяти тот же поиск идет запросами к БД.
+        search = (
+            ingredient_index.search if settings.INGREDIENT_INDEX
+            else search_ingredients
+        )
+        return self.cached_response(
+            request,
+            lambda: self.get_serializer(search(name), many=True).data
+        )
 
-class FavoriteView(APIView):
-    pagination_class = None
-    permission_classes = (IsAuthenticatedOrReadOnly,)
 
-    @action(
-        methods=['post'],
-        detail=True,
-    )
+class UserRecipeRelationView(APIView):
+    model = None
+    counter_field = None
+    exists_message = None
+    missing_message = None
+    permission_classes = (IsAuthenticated,)
+
     def post(self, request, recipe_id):
         user = request.user
-        data = {
-            'user': user.id,
-            'recipe': recipe_id,
-        }
-        context = {'request': request}
-        serializer = FavoriteSerializer(data=data, context=context)
-        if Favorite.objects.filter(user=user, recipe_id=recipe_id).exists():
-            return Response(
-                {'detail': 'Рецепт уже в избранном'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        if not serializer.is_valid():
+        try:
+            with transaction.atomic():
+                self.model.objects.create(user=user, recipe_id=recipe_id)
+        except IntegrityError:
+            get_object_or_404(Recipe, id=recipe_id)
             return Response(
-                serializer.errors,
+                {'detail': self.exists_message},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        Favorite.objects.create(user=user, recipe_id=recipe_id)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(
+            {'user': user.id, 'recipe': recipe_id},
+            status=status.HTTP_201_CREATED
+        )
 
-    @action(
-        methods=['delete'],
-        detail=True,
-    )
     def delete(self, request, recipe_id):
-        user = request.user
-        recipe = get_object_or_404(Recipe, id=recipe_id)
-        if not Favorite.objects.filter(user=user, recipe=recipe).exists():
+        # Параллельные удаления одной строки видят ее все, а сигналы
+        # post_delete отправил бы каждый. Поэтому счетчик меняется
+        # по числу действительно удаленных строк.
+        with transaction.atomic():
+            deleted = raw_delete(self.model.objects.filter(
+                user=request.user, recipe_id=recipe_id
+            ))
+            if deleted:
+                self.perform_delete(request.user, recipe_id)
+        if not deleted:
+            get_object_or_404(Recipe, id=recipe_id)
             return Response(
-                {'detail': 'Этого рецепта нет в избранном'},
+                {'detail': self.missing_message},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        Favorite.objects.filter(user=user, recipe=recipe).delete()
         return Response(
             {'detail': 'Рецепт удален'},
             status=status.HTTP_204_NO_CONTENT
         )
 
+    def perform_delete(self, user, recipe_id):
+        change_counter(Recipe, [recipe_id], self.counter_field, -1)
+
+
+class FavoriteView(UserRecipeRelationView):
+    model = Favorite
+    counter_field = 'favorites_count'
+    exists_message = 'Рецепт уже в избранном'
+    missing_message = 'Этого рецепта нет в избранном'
+
+
+class UserRecipeBatchView(APIView):
+    model = None
+    permission_classes = (IsAuthenticated,)
+
+    def get_ids(self, request):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return list(dict.fromkeys(serializer.validated_data['ids']))
+
+    def perform_bulk_create(self, user, recipe_ids):
+        self.model.objects.bulk_create(
+            [self.model(user=user, recipe_id=pk) for pk in recipe_ids],
+            ignore_conflicts=True
+        )
+        # bulk_create не отправляет сигналы, поэтому счетчики
+        # пересчитываются явно.
+        recount_locked_recipes(recipe_ids)
+
+    def perform_bulk_delete(self, user, recipe_ids):
+        # Как и при добавлении, счетчики пересчитываются одним запросом
+        # вместо сигнала post_delete на каждую строку.
+        raw_delete(self.model.objects.filter(
+            user=user, recipe_id__in=recipe_ids
+        ))
+        recount_locked_recipes(recipe_ids)
+
+    def post(self, request):
+        user = request.user
+        ids = self.get_ids(request)
+        recipes = dict(
+            Recipe.objects.filter(id__in=ids).annotate(
+                related=Exists(self.model.objects.filter(
+                    user=user, recipe=OuterRef('pk')
+                ))
+            ).values_list('id', 'related')
+        )
+        added = [pk for pk in ids if recipes.get(pk) is False]
+        if added:
+            with transaction.atomic():
+                self.perform_bulk_create(user, added)
+        results = []
+        for pk in ids:
+            if pk not in recipes:
+                result = 'not_found'
+            elif recipes[pk]:
+                result = 'exists'
+            else:
+                result = 'added'
+            results.append({'id': pk, 'status': result})
+        return Response({'results': results})
+
+    def delete(self, request):
+        user = request.user
+        ids = self.get_ids(request)
+        removed = set(self.model.objects.filter(
+            user=user, recipe_id__in=ids
+        ).values_list('recipe_id', flat=True))
+        if removed:
+            with transaction.atomic():
+                self.perform_bulk_delete(user, removed)
+        return Response({'results': [
+            {'id': pk, 'status': 'removed' if pk in removed else 'missing'}
+            for pk in ids
+        ]})
+
+
+class FavoriteBatchView(UserRecipeBatchView):
+    model = Favorite
+
+
+class ShoppingCartBatchView(UserRecipeBatchView):
+    model = ShoppingCart
+
+    def perform_bulk_create(self, user, recipe_ids):
+        super().perform_bulk_create(user, recipe_ids)
+        invalidate_shopping_lists([user.id])
+
+    def perform_bulk_delete(self, user, recipe_ids):
+        super().perform_bulk_delete(user, recipe_ids)
+        invalidate_shopping_lists([user.id])
+
 
 class FavoriteListView(ListAPIView):
-    pagination_class = None
+    pagination_class = OptInCursorOnlyPagination
+    cursor_ordering = ('-created_at', '-id')
     serializer_class = FavoriteSerializer
     filter_backends = (DjangoFilterBackend,)
     permission_classes = (IsAuthenticatedOrReadOnly,)
@@ -152,102 +308,46 @@ class FavoriteListView(ListAPIView):
         return Favorite.objects.filter(user=self.request.user)
 
 
-class ShoppingCartView(APIView):
-    pagination_class = None
+class ShoppingCartView(UserRecipeRelationView):
+    model = ShoppingCart
+    counter_field = 'in_carts_count'
+    exists_message = 'Рецепт уже в корзине'
+    missing_message = 'Этого рецепта нет в корзине'
 
-    @action(
-        methods=['post'],
-        detail=True,
-    )
-    def post(self, request, recipe_id):
-        user = request.user
-        data = {
-            'user': user.id,
-            'recipe': recipe_id,
-        }
-        context = {'request': request}
-        serializer = ShoppingCartSerializer(
-            data=data, context=context
-        )
-        if ShoppingCart.objects.filter(
-            user=user,
-            recipe_id=recipe_id
-        ).exists():
-            return Response(
-                {'detail': 'Рецепт уже в корзине'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        if not serializer.is_valid():
-            return Response(
-                serializer.errors,
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        ShoppingCart.objects.create(user=user, recipe_id=recipe_id)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-    @action(
-        methods=['delete'],
-        detail=True,
-    )
-    def delete(self, request, recipe_id):
-        user = request.user
-        recipe = get_object_or_404(Recipe, id=recipe_id)
-        if not ShoppingCart.objects.filter(user=user, recipe=recipe).exists():
-            return Response(
-                {'detail': 'Этого рецепта нет в корзине'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        ShoppingCart.objects.filter(user=user, recipe=recipe).delete()
-        return Response(
-            {'detail': 'Рецепт удален'},
-            status=status.HTTP_204_NO_CONTENT
-        )
+    def perform_delete(self, user, recipe_id):
+        super().perform_delete(user, recipe_id)
+        invalidate_shopping_lists([user.id])
 
 
 @api_view(['GET'])
+@renderer_classes(
+    [PDFRenderer, PlainTextRenderer, CSVRenderer, JSONRenderer]
+)
+@permission_classes([IsAuthenticated])
 def download_shopping_cart(request):
-    app_path = path.realpath(path.dirname(__file__))
-    font_path = path.join(app_path, 'fonts/Roboto-Italic.ttf')
-    user = request.user
-    shopping_cart = user.shopping_cart.all()
-    buying_list = {}
-    for record in shopping_cart:
-        recipe = record.recipe
-        ingredients = IngredientInRecipe.objects.filter(recipe=recipe)
-        for ingredient in ingredients:
-            amount = ingredient.amount
-            name = ingredient.ingredient.name
-            measurement_unit = ingredient.ingredient.measurement_unit
-            if name not in buying_list:
-                buying_list[name] = {
-                    'measurement_unit': measurement_unit,
-                    'amount': amount
-                }
-            else:
-                buying_list[name]['amount'] = (
-                    buying_list[name]['amount'] + amount
-                )
-    wishlist = []
-    for name, data in buying_list.items():
-        wishlist.append(
-            f'{name} - {data["amount"]} {data["measurement_unit"]}'
+    renderer = request.accepted_renderer
+    if renderer.format in EXPORTERS:
+        response = StreamingHttpResponse(
+            EXPORTERS[renderer.format](
+                get_cached_shopping_list(request.user)
+            ),
+            content_type=f'{renderer.media_type}; charset=utf-8'
         )
-    buffer = io.BytesIO()
-    pdfmetrics.registerFont(
-        TTFont('Roboto', font_path)
+        response['Content-Disposition'] = (
+            f'attachment; filename="Shopping.{renderer.format}"'
+        )
+        return response
+    return FileResponse(
+        io.BytesIO(get_cached_shopping_list_pdf(request.user)),
+        as_attachment=True,
+        filename='Shopping.pdf'
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    return HttpResponse(
+        render_prometheus(registry.snapshot()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
     )
-    p = canvas.Canvas(buffer)
-    x = 0.4 * inch
-    y = 11 * inch
-    p.setFont('Roboto', 14)
-    p.drawString(x, y, 'Ваш список покупок сформирован Foodgram:')
-    x += 15
-    y -= 25
-    for item in wishlist:
-        p.setFont('Roboto', 12)
-        p.drawString(x, y, item)
-        y = y - 15
-    p.showPage()
-    p.save()
-    buffer.seek(0)
-    return FileResponse(buffer, as_attachment=True, filename='Shopping.pdf')
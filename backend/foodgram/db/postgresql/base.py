@@ -0,0 +1,161 @@
+"""PostgreSQL с проверкой соединений и необязательным пулом.
+
+Проверка повторяет CONN_HEALTH_CHECKS из Django 4.1: постоянное соединение
+проверяется перед первым запросом к БД в рамках HTTP-запроса. При POOL_SIZE
+больше нуля соединения берутся из общего для потоков пула psycopg2, а при
+закрытии возвращаются в него. Если пул занят, поток ждет до POOL_TIMEOUT
+секунд. С пулом CONN_MAX_AGE не действует: соединение возвращается в пул
+в конце каждого запроса.
+"""
+import threading
+import time
+
+import psycopg2.extensions
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """Пул, в котором поток ждет свободное соединение.
+
+    ThreadedConnectionPool сразу бросает PoolError, если все соединения
+    заняты, поэтому потоков в воркере может быть больше, чем POOL_SIZE,
+    только с ожиданием. Ошибка будет, если за timeout секунд никто
+    не вернул соединение.
+    """
+
+    def __init__(self, minconn, maxconn, *args, timeout=None, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError('connection pool exhausted')
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+def get_pool(alias, size, timeout, conn_params):
+    key = (alias, size, timeout, repr(sorted(conn_params.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            # psycopg2 держит открытыми только minconn свободных
+            # соединений и закрывает остальные при возврате.
+            pool = _pools[key] = BlockingConnectionPool(
+                size, size, timeout=timeout, **conn_params
+            )
+        return pool
+
+
+def is_alive(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not connection.autocommit:
+            connection.rollback()
+    except psycopg2.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    health_check_done = False
+    pool = None
+
+    @property
+    def health_check_enabled(self):
+        return self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+
+    @property
+    def pool_size(self):
+        return self.settings_dict.get('POOL_SIZE', 0)
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_size:
+            self.pool = None
+            return super().get_new_connection(conn_params)
+        self.pool = get_pool(
+            self.alias,
+            self.pool_size,
+            self.settings_dict.get('POOL_TIMEOUT'),
+            conn_params
+        )
+        connection = self.pool.getconn()
+        while self.health_check_enabled and not is_alive(connection):
+            self.pool.putconn(connection, close=True)
+            connection = self.pool.getconn()
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def connect(self):
+        super().connect()
+        if self.pool is not None:
+            # Иначе поток держал бы соединение до CONN_MAX_AGE, и при
+            # потоках больше POOL_SIZE остальные ждали бы его впустую.
+            self.close_at = time.monotonic()
+        self.health_check_done = True
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            super()._close()
+            return
+        connection = self.connection
+        with self.wrap_database_errors:
+            status = (
+                psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+                if connection.closed
+                else connection.get_transaction_status()
+            )
+            broken = (
+                status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+                or self.errors_occurred and not self.is_usable()
+            )
+            if (
+                not broken
+                and status != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+            ):
+                connection.rollback()
+            self.pool.putconn(connection, close=broken)
+
+    def close_if_unusable_or_obsolete(self):
+        self.health_check_done = False
+        super().close_if_unusable_or_obsolete()
+
+    def close_if_health_check_failed(self):
+        if (
+            self.connection is None
+            or not self.health_check_enabled
+            or self.health_check_done
+            or self.in_atomic_block
+        ):
+            return
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
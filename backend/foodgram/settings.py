@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -85,17 +86,69 @@ WSGI_APPLICATION = 'foodgram.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))
+
+# Django 3.2 молча игнорирует CONN_HEALTH_CHECKS и POOL_SIZE, а без проверок
+# постоянные соединения опасны. Поэтому, если они включены, стандартный
+# бэкенд PostgreSQL подменяется своим.
+DB_ENGINE = os.getenv('DB_ENGINE') or 'django.db.backends.postgresql'
+if (DB_CONN_HEALTH_CHECKS or DB_POOL_SIZE) and DB_ENGINE in (
+    'django.db.backends.postgresql',
+    'django.db.backends.postgresql_psycopg2',
+):
+    DB_ENGINE = 'foodgram.db.postgresql'
+
 DATABASES = {
     'default': {
-        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.postgresql'),
+        'ENGINE': DB_ENGINE,
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        # С пулом CONN_MAX_AGE не действует, см. foodgram/db/postgresql.
+        'POOL_SIZE': DB_POOL_SIZE,
+        'POOL_TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'foodgram'),
     }
 }
 
+INGREDIENT_INDEX = os.getenv('INGREDIENT_INDEX', 'True') == 'True'
+
+THUMBNAIL_WORKERS = int(os.getenv('THUMBNAIL_WORKERS', 2))
+
+# Ленту подписок тех, кто подписан не больше чем на столько авторов,
+# дешевле собрать прямо из рецептов, чем читать из FeedItem.
+FEED_FANOUT_ON_READ_LIMIT = int(os.getenv('FEED_FANOUT_ON_READ_LIMIT', 20))
+
+# Включается в foodgram/asgi.py: горячие эндпоинты становятся async
+# и выполняют работу в пуле из ASYNC_THREADS потоков.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+ASYNC_THREADS = int(os.getenv('ASYNC_THREADS', 8))
+
+# LocMemCache и DummyCache у каждого процесса свои: выход или смена пароля
+# в одном воркере не дошли бы до остальных, поэтому с ними токены
+# проверяются в БД на каждом запросе.
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+TOKEN_CACHE = CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+TOKEN_CACHE_TIMEOUT = int(os.getenv('TOKEN_CACHE_TIMEOUT', 300))
+TOKEN_LOCAL_CACHE_SIZE = int(os.getenv('TOKEN_LOCAL_CACHE_SIZE', 1024))
+TOKEN_LOCAL_CACHE_TIMEOUT = int(os.getenv('TOKEN_LOCAL_CACHE_TIMEOUT', 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -146,7 +199,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication'
+        if TOKEN_CACHE
+        else 'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': [
         'rest_framework.pagination.PageNumberPagination',
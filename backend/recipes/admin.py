@@ -1,5 +1,4 @@
 from django.contrib import admin
-from django.db.models import Count
 from users.models import Follow
 
 from .models import Favorite, Ingredient, Recipe, ShoppingCart, Tag
@@ -18,21 +17,12 @@ class RecipeAdmin(admin.ModelAdmin):
         IngredientsInLine, TagsInLine
     ]
     list_display = (
-        'id', 'name', 'author', 'text', 'pub_date', 'favorite_count'
+        'id', 'name', 'author', 'text', 'pub_date', 'favorites_count'
     )
     search_fields = ('name', 'author', 'tags')
     list_filter = ('name', 'author', 'tags', 'pub_date')
     empty_value_display = '---'
 
-    def favorite_count(self, obj):
-        return obj.obj_count
-
-    def get_queryset(self, request):
-        queryset = super().get_queryset(request)
-        return queryset.annotate(
-            obj_count=Count('favorite', distinct=True)
-        )
-
 
 class IngredientAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'measurement_unit')
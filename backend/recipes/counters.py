@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Favorite, Recipe, ShoppingCart
+
+User = get_user_model()
+
+
+def change_counter(model, ids, field, delta):
+    model.objects.filter(pk__in=ids).update(**{field: F(field) + delta})
+
+
+def change_favorites_count(recipe_ids, delta):
+    change_counter(Recipe, recipe_ids, 'favorites_count', delta)
+
+
+def change_in_carts_count(recipe_ids, delta):
+    change_counter(Recipe, recipe_ids, 'in_carts_count', delta)
+
+
+def change_recipes_count(user_ids, delta):
+    change_counter(User, user_ids, 'recipes_count', delta)
+
+
+def raw_delete(queryset):
+    """Удаляет строки одним DELETE, без сигналов post_delete.
+
+    Годится только для моделей без зависимых строк. Счетчики и кэши,
+    которые обновляют сигналы, вызывающий код обновляет сам.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def count_subquery(model, field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{field: OuterRef('pk')}).order_by().values(
+                field
+            ).annotate(total=Count('pk')).values('total')
+        ),
+        Value(0)
+    )
+
+
+def recount_recipes(queryset):
+    queryset.update(
+        favorites_count=count_subquery(Favorite, 'recipe'),
+        in_carts_count=count_subquery(ShoppingCart, 'recipe'),
+    )
+
+
+def recount_locked_recipes(recipe_ids):
+    """Пересчитывает счетчики рецептов, сначала заблокировав их строки.
+
+    Подзапросы UPDATE видят данные на момент начала запроса. Если UPDATE
+    ждал блокировки строки, то поверх чужого F('x') + 1 легло бы
+    устаревшее значение. После SELECT FOR UPDATE пересчет начинается уже
+    с блокировкой и видит все закоммиченные изменения. Вызывать внутри
+    транзакции.
+    """
+    list(
+        Recipe.objects.select_for_update().filter(id__in=recipe_ids)
+        .order_by('id').values_list('id', flat=True)
+    )
+    recount_recipes(Recipe.objects.filter(id__in=recipe_ids))
+
+
+def recount():
+    recount_recipes(Recipe.objects.all())
+    User.objects.update(recipes_count=count_subquery(Recipe, 'author'))
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+
+from django.apps import apps
+
+DATA_FILE = 'data.ndjson'
+MEDIA_DIR = 'media'
+MODELS = (
+    'users.User',
+    'users.Follow',
+    'recipes.Tag',
+    'recipes.Ingredient',
+    'recipes.Recipe',
+    'recipes.IngredientInRecipe',
+    'recipes.TagInRecipe',
+    'recipes.Favorite',
+    'recipes.ShoppingCart',
+)
+
+
+def get_models():
+    return [apps.get_model(label) for label in MODELS]
+
+
+def get_fields(model):
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+@contextmanager
+def keep_dates(model):
+    """Не дает auto_now_add затереть даты из выгрузки."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
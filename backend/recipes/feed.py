@@ -0,0 +1,58 @@
+from users.models import Follow
+
+from .models import FeedItem, Recipe
+
+FEED_BATCH_SIZE = 1000
+
+
+def fan_out(recipe):
+    """Кладет новый рецепт в ленты всех подписчиков автора."""
+    FeedItem.objects.bulk_create(
+        (
+            FeedItem(user_id=user_id, recipe=recipe, pub_date=recipe.pub_date)
+            for user_id in Follow.objects.filter(
+                following_id=recipe.author_id
+            ).values_list('user_id', flat=True).iterator()
+        ),
+        batch_size=FEED_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def backfill(user_id, author_id):
+    """Добавляет в ленту все рецепты автора, на которого подписались."""
+    FeedItem.objects.bulk_create(
+        (
+            FeedItem(user_id=user_id, recipe_id=recipe_id, pub_date=pub_date)
+            for recipe_id, pub_date in Recipe.objects.filter(
+                author_id=author_id
+            ).values_list('id', 'pub_date').iterator()
+        ),
+        batch_size=FEED_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def remove(user_id, author_id):
+    """Убирает из ленты рецепты автора после отписки."""
+    FeedItem.objects.filter(
+        user_id=user_id, recipe__author_id=author_id
+    ).delete()
+
+
+def rebuild_feed():
+    """Собирает ленты заново, например после массовой загрузки данных."""
+    FeedItem.objects.all().delete()
+    FeedItem.objects.bulk_create(
+        (
+            FeedItem(user_id=user_id, recipe_id=recipe_id, pub_date=pub_date)
+            for user_id, recipe_id, pub_date in Follow.objects.filter(
+                following__recipe__isnull=False
+            ).values_list(
+                'user_id', 'following__recipe__id',
+                'following__recipe__pub_date'
+            ).iterator()
+        ),
+        batch_size=FEED_BATCH_SIZE,
+        ignore_conflicts=True
+    )
@@ -0,0 +1,63 @@
+import datetime
+import os
+import shutil
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from recipes.dump import DATA_FILE, MEDIA_DIR, get_fields, get_models
+from recipes.thumbnails import thumbnail_names
+
+
+class Encoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает пользователей, подписки, рецепты и связи в NDJSON '
+        'вместе с картинками рецептов и их превью'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Каталог для выгрузки')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        os.makedirs(path, exist_ok=True)
+        encoder = Encoder(ensure_ascii=False)
+        with open(
+            os.path.join(path, DATA_FILE), 'w', encoding='utf-8'
+        ) as file:
+            for model in get_models():
+                label = model._meta.label
+                fields = get_fields(model)
+                rows = model.objects.order_by('pk').values_list(*fields)
+                count = 0
+                for row in rows.iterator(chunk_size=options['chunk_size']):
+                    values = dict(zip(fields, row))
+                    file.write(encoder.encode(
+                        {'model': label, 'fields': values}
+                    ))
+                    file.write('\n')
+                    count += 1
+                    if label == 'recipes.Recipe':
+                        self.copy_image(values['image'], path)
+                        if values['thumbnails_ready']:
+                            for name in thumbnail_names(values['image']):
+                                self.copy_image(name, path)
+                self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Выгрузка сохранена в {path}'))
+
+    def copy_image(self, name, path):
+        if not name or not default_storage.exists(name):
+            return
+        target = os.path.join(path, MEDIA_DIR, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with default_storage.open(name) as source:
+            with open(target, 'wb') as destination:
+                shutil.copyfileobj(source, destination)
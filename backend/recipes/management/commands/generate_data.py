@@ -0,0 +1,145 @@
+import random
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from recipes.consts import TAG_COLORS
+from recipes.counters import recount
+from recipes.feed import rebuild_feed
+from recipes.models import (Favorite, Ingredient, IngredientInRecipe, Recipe,
+                            ShoppingCart, Tag, TagInRecipe)
+from users.models import Follow
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими данными для нагрузочных тестов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--recipes', type=int, default=1000)
+        parser.add_argument('--ingredients', type=int, default=2000)
+        parser.add_argument('--ingredients-per-recipe', type=int, default=8)
+        parser.add_argument('--tags-per-recipe', type=int, default=2)
+        parser.add_argument('--follows', type=int, default=10)
+        parser.add_argument('--favorites', type=int, default=20)
+        parser.add_argument('--carts', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(
+            objects, batch_size=self.batch_size, ignore_conflicts=True
+        )
+
+    def create_tags(self):
+        self.bulk_create(Tag, [
+            Tag(name=name, color=color, slug=f'tag-{number}')
+            for number, (color, name) in enumerate(TAG_COLORS)
+        ])
+        return list(Tag.objects.values_list('id', flat=True))
+
+    def create_ingredients(self, count):
+        missing = count - Ingredient.objects.count()
+        if missing > 0:
+            self.bulk_create(Ingredient, [
+                Ingredient(name=f'Ингредиент {number}', measurement_unit='г')
+                for number in range(missing)
+            ])
+        return list(Ingredient.objects.values_list('id', flat=True))
+
+    def create_users(self, count, prefix):
+        self.bulk_create(User, [
+            User(
+                username=f'{prefix}_{number}',
+                email=f'{prefix}_{number}@example.com',
+                first_name='Тест',
+                last_name=str(number),
+            ) for number in range(count)
+        ])
+        return list(User.objects.filter(
+            username__startswith=f'{prefix}_'
+        ).values_list('id', flat=True))
+
+    def create_recipes(self, count, user_ids, prefix):
+        self.bulk_create(Recipe, [
+            Recipe(
+                author_id=random.choice(user_ids),
+                name=f'{prefix} рецепт {number}',
+                text='Синтетический рецепт для нагрузочного теста',
+                cooking_time=random.randint(5, 180),
+            ) for number in range(count)
+        ])
+        recipe_ids = list(Recipe.objects.filter(
+            name__startswith=f'{prefix} '
+        ).order_by('id').values_list('id', flat=True))
+        # auto_now_add ставит всей пачке одно и то же время, поэтому
+        # рецепты разносятся по времени, как в живой ленте.
+        start = timezone.now() - timedelta(minutes=len(recipe_ids))
+        Recipe.objects.bulk_update(
+            [
+                Recipe(
+                    id=recipe_id, pub_date=start + timedelta(minutes=number)
+                ) for number, recipe_id in enumerate(recipe_ids)
+            ],
+            ['pub_date'],
+            batch_size=self.batch_size
+        )
+        return recipe_ids
+
+    def sample(self, population, size):
+        return random.sample(population, min(size, len(population)))
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = f'bench_{uuid.uuid4().hex[:8]}'
+        with transaction.atomic():
+            tag_ids = self.create_tags()
+            ingredient_ids = self.create_ingredients(options['ingredients'])
+            user_ids = self.create_users(options['users'], prefix)
+            recipe_ids = self.create_recipes(
+                options['recipes'], user_ids, prefix
+            )
+            self.bulk_create(IngredientInRecipe, [
+                IngredientInRecipe(
+                    recipe_id=recipe_id,
+                    ingredient_id=ingredient_id,
+                    amount=random.randint(1, 500)
+                )
+                for recipe_id in recipe_ids
+                for ingredient_id in self.sample(
+                    ingredient_ids, options['ingredients_per_recipe']
+                )
+            ])
+            self.bulk_create(TagInRecipe, [
+                TagInRecipe(recipe_id=recipe_id, tags_id=tag_id)
+                for recipe_id in recipe_ids
+                for tag_id in self.sample(
+                    tag_ids, options['tags_per_recipe']
+                )
+            ])
+            self.bulk_create(Follow, [
+                Follow(user_id=user_id, following_id=following_id)
+                for user_id in user_ids
+                for following_id in self.sample(user_ids, options['follows'])
+                if following_id != user_id
+            ])
+            for model, option in (
+                (Favorite, 'favorites'), (ShoppingCart, 'carts')
+            ):
+                self.bulk_create(model, [
+                    model(user_id=user_id, recipe_id=recipe_id)
+                    for user_id in user_ids
+                    for recipe_id in self.sample(recipe_ids, options[option])
+                ])
+            recount()
+            rebuild_feed()
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: {len(user_ids)} пользователей ({prefix}_*), '
+            f'{len(recipe_ids)} рецептов'
+        ))
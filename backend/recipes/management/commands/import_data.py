@@ -0,0 +1,116 @@
+import json
+import os
+from itertools import groupby
+
+from api.cache import INGREDIENTS_VERSION_KEY, TAGS_VERSION_KEY, bump_version
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from recipes.counters import recount
+from recipes.dump import DATA_FILE, MEDIA_DIR, MODELS, get_models, keep_dates
+from recipes.feed import rebuild_feed
+from recipes.thumbnails import thumbnail_names
+
+
+class Command(BaseCommand):
+    help = 'Загружает выгрузку, сделанную командой export_data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Каталог с выгрузкой')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        data_file = os.path.join(path, DATA_FILE)
+        if not os.path.exists(data_file):
+            raise CommandError(f'Не найден файл {data_file}')
+        models = []
+        self.missing_thumbnails = 0
+        try:
+            with transaction.atomic():
+                self.check_empty()
+                self.load_file(data_file, path, models, options['batch_size'])
+        except IntegrityError as error:
+            raise CommandError(f'Не удалось загрузить выгрузку: {error}')
+        self.reset_sequences(models)
+        bump_version(TAGS_VERSION_KEY)
+        bump_version(INGREDIENTS_VERSION_KEY)
+        self.stdout.write(self.style.SUCCESS('Выгрузка загружена'))
+        if self.missing_thumbnails:
+            self.stdout.write(self.style.WARNING(
+                f'Рецептов без превью: {self.missing_thumbnails}, '
+                'создайте их командой make_thumbnails'
+            ))
+
+    def check_empty(self):
+        # Строки с занятыми id или уникальными полями пришлось бы пропускать,
+        # и дочерние записи выгрузки прицепились бы к чужим строкам.
+        for model in get_models():
+            if model.objects.exists():
+                raise CommandError(
+                    f'В таблице {model._meta.label} уже есть записи, '
+                    'выгрузка загружается только в пустую базу'
+                )
+
+    def load_file(self, data_file, path, models, batch_size):
+        with open(data_file, encoding='utf-8') as file:
+            rows = (json.loads(line) for line in file if line.strip())
+            for label, group in groupby(rows, key=lambda row: row['model']):
+                if label not in MODELS:
+                    raise CommandError(f'Неизвестная модель: {label}')
+                model = apps.get_model(label)
+                models.append(model)
+                count = self.load(model, group, path, batch_size)
+                self.stdout.write(f'{label}: {count}')
+        # bulk_create не отправляет сигналы: счетчики и ленты
+        # пересчитываются по загруженным строкам.
+        recount()
+        rebuild_feed()
+
+    def load(self, model, rows, path, batch_size):
+        count = 0
+        batch = []
+        with keep_dates(model):
+            for row in rows:
+                fields = row['fields']
+                if model._meta.label == 'recipes.Recipe':
+                    self.load_images(fields, path)
+                batch.append(model(**fields))
+                if len(batch) == batch_size:
+                    model.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            model.objects.bulk_create(batch)
+        return count + len(batch)
+
+    def load_images(self, fields, path):
+        fields['image'] = self.copy_image(fields['image'], path)
+        if not fields['image'] or not fields.get('thumbnails_ready'):
+            fields['thumbnails_ready'] = False
+            return
+        # Без файлов превью флаг отдал бы клиентам битые ссылки.
+        names = thumbnail_names(fields['image'])
+        fields['thumbnails_ready'] = all(
+            default_storage.exists(self.copy_image(name, path))
+            for name in names
+        )
+        if not fields['thumbnails_ready']:
+            self.missing_thumbnails += 1
+
+    def copy_image(self, name, path):
+        if not name or default_storage.exists(name):
+            return name
+        source = os.path.join(path, MEDIA_DIR, name)
+        if not os.path.exists(source):
+            return name
+        with open(source, 'rb') as file:
+            return default_storage.save(name, File(file))
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -1,17 +1,108 @@
 import csv
+import json
+import os
+import re
+from itertools import islice
 
-from django.core.management.base import BaseCommand
+from api.cache import INGREDIENTS_VERSION_KEY, bump_version
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
 from recipes.models import Ingredient
 
+CHUNK_SIZE = 64 * 1024
+SEPARATORS = re.compile(r'[\s,\[\]]*')
+
+
+def read_csv(file):
+    for row in csv.reader(file):
+        if len(row) >= 2:
+            yield row[0], row[1]
+
+
+def read_json(file):
+    """Читает массив объектов или NDJSON, не загружая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                if position < len(buffer):
+                    raise CommandError(
+                        f'Некорректный JSON: {buffer[position:][:50]}'
+                    )
+                return
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield item['name'], item['measurement_unit']
+
+
+READERS = {
+    '.csv': read_csv,
+    '.json': read_json,
+    '.ndjson': read_json,
+}
+
 
 class Command(BaseCommand):
+    help = (
+        'Загружает ингредиенты из CSV или JSON пачками. '
+        'Уже существующие ингредиенты пропускаются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='ingredients.csv',
+            help='Файл с ингредиентами (.csv, .json или .ndjson)'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--skip', type=int, default=0,
+            help='Пропустить первые N строк, чтобы продолжить загрузку'
+        )
+
     def handle(self, *args, **options):
-        with open('ingredients.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file, delimiter=',')
-            Ingredient.objects.bulk_create([
-                Ingredient(
-                    id=number + 1,
-                    name=line[0],
-                    measurement_unit=line[1]
-                ) for number, line in enumerate(reader)
-            ])
+        path = options['path']
+        reader = READERS.get(os.path.splitext(path)[1].lower())
+        if reader is None:
+            raise CommandError(f'Неизвестный формат файла: {path}')
+        batch_size = options['batch_size']
+        processed = options['skip']
+        before = Ingredient.objects.count()
+        with open(path, encoding='utf-8') as file:
+            rows = islice(reader(file), options['skip'], None)
+            while True:
+                batch = [
+                    Ingredient(
+                        name=name.strip(),
+                        measurement_unit=measurement_unit.strip()
+                    ) for name, measurement_unit in islice(rows, batch_size)
+                ]
+                if not batch:
+                    break
+                Ingredient.objects.bulk_create(batch, ignore_conflicts=True)
+                processed += len(batch)
+                self.stdout.write(
+                    f'Обработано строк: {processed} '
+                    f'(продолжить: --skip {processed})'
+                )
+        self.reset_sequence()
+        bump_version(INGREDIENTS_VERSION_KEY)
+        created = Ingredient.objects.count() - before
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: обработано {processed}, добавлено {created}'
+        ))
+
+    def reset_sequence(self):
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [Ingredient]
+        )
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from recipes.models import Recipe
+from recipes.thumbnails import process_recipe
+
+
+class Command(BaseCommand):
+    help = (
+        'Создает превью для рецептов, у которых их еще нет. '
+        'Подходит для запуска по расписанию'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересоздать превью для всех рецептов'
+        )
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.exclude(image='')
+        if not options['all']:
+            recipes = recipes.filter(thumbnails_ready=False)
+        count = 0
+        for recipe_id, image_name in list(
+            recipes.values_list('id', 'image')
+        ):
+            count += process_recipe(recipe_id, image_name)
+        self.stdout.write(self.style.SUCCESS(f'Обработано рецептов: {count}'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from recipes.feed import rebuild_feed
+
+
+class Command(BaseCommand):
+    help = 'Собирает ленты подписок заново по подпискам и рецептам'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_feed()
+        self.stdout.write(self.style.SUCCESS('Ленты подписок собраны'))
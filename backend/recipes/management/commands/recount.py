@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from recipes.counters import recount
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счетчики избранного, корзин и рецептов автора'
+
+    def handle(self, *args, **options):
+        recount()
+        self.stdout.write(self.style.SUCCESS('Счетчики пересчитаны'))
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.18 on 2026-10-18 07:13
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicates(apps, schema_editor):
+    IngredientInRecipe = apps.get_model('recipes', 'IngredientInRecipe')
+    TagInRecipe = apps.get_model('recipes', 'TagInRecipe')
+    duplicates = IngredientInRecipe.objects.values(
+        'recipe', 'ingredient'
+    ).annotate(
+        rows=Count('id'), keep_id=Min('id'), total=Sum('amount')
+    ).filter(rows__gt=1)
+    for row in duplicates:
+        IngredientInRecipe.objects.filter(
+            recipe=row['recipe'], ingredient=row['ingredient']
+        ).exclude(id=row['keep_id']).delete()
+        IngredientInRecipe.objects.filter(id=row['keep_id']).update(
+            amount=row['total']
+        )
+    duplicates = TagInRecipe.objects.values('recipe', 'tags').annotate(
+        rows=Count('id'), keep_id=Min('id')
+    ).filter(rows__gt=1)
+    for row in duplicates:
+        TagInRecipe.objects.filter(
+            recipe=row['recipe'], tags=row['tags']
+        ).exclude(id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['user', '-created_at'], name='favorite_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-pub_date'], name='recipe_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-pub_date'], name='recipe_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shoppingcart',
+            index=models.Index(fields=['user', '-created_at'], name='cart_user_created_idx'),
+        ),
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='ingredientinrecipe',
+            constraint=models.UniqueConstraint(fields=('recipe', 'ingredient'), name='unique_ingredient_in_recipe'),
+        ),
+        migrations.AddConstraint(
+            model_name='taginrecipe',
+            constraint=models.UniqueConstraint(fields=('recipe', 'tags'), name='unique_tag_in_recipe'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 3.2.18 on 2026-10-18 07:22
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicates(apps, schema_editor):
+    Ingredient = apps.get_model('recipes', 'Ingredient')
+    IngredientInRecipe = apps.get_model('recipes', 'IngredientInRecipe')
+    duplicates = Ingredient.objects.values(
+        'name', 'measurement_unit'
+    ).annotate(rows=Count('id'), keep_id=Min('id')).filter(rows__gt=1)
+    for duplicate in duplicates:
+        keep_id = duplicate['keep_id']
+        extra_ids = list(Ingredient.objects.filter(
+            name=duplicate['name'],
+            measurement_unit=duplicate['measurement_unit']
+        ).exclude(id=keep_id).values_list('id', flat=True))
+        amounts = IngredientInRecipe.objects.filter(
+            ingredient_id__in=[keep_id, *extra_ids]
+        ).order_by('recipe_id', 'id')
+        # В рецепте может оказаться и оставляемый ингредиент, и его дубль,
+        # а пара (recipe, ingredient) уникальна: количества складываются
+        # в одну строку.
+        rows_by_recipe = {}
+        for row in amounts:
+            rows_by_recipe.setdefault(row.recipe_id, []).append(row)
+        for rows in rows_by_recipe.values():
+            kept = next(
+                (row for row in rows if row.ingredient_id == keep_id), rows[0]
+            )
+            IngredientInRecipe.objects.filter(
+                id__in=[row.id for row in rows if row is not kept]
+            ).delete()
+            IngredientInRecipe.objects.filter(id=kept.id).update(
+                ingredient_id=keep_id,
+                amount=sum(row.amount for row in rows)
+            )
+        Ingredient.objects.filter(id__in=extra_ids).delete()
+
+
+class Migration(migrations.Migration):
+    # В PostgreSQL удаление и перенос строк с отложенными внешними ключами
+    # нельзя совмещать с ALTER TABLE в одной транзакции, поэтому слияние
+    # дублей фиксируется отдельно, до добавления ограничения.
+    atomic = False
+
+    dependencies = [
+        ('recipes', '0004_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicates, migrations.RunPython.noop, atomic=True
+        ),
+        migrations.AddConstraint(
+            model_name='ingredient',
+            constraint=models.UniqueConstraint(fields=('name', 'measurement_unit'), name='unique_ingredient'),
+        ),
+    ]
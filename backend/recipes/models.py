@@ -43,6 +43,14 @@ class Ingredient(models.Model):
         help_text='Единица измерения'
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('name', 'measurement_unit'),
+                name='unique_ingredient'
+            )
+        ]
+
     def __str__(self):
         return f'{self.name} {self.measurement_unit}'
 
@@ -65,6 +73,7 @@ class Recipe(models.Model):
         'Картинка',
         blank=True
     )
+    thumbnails_ready = models.BooleanField(default=False, editable=False)
     text = models.TextField(verbose_name='Описание рецепта')
     ingredients = models.ManyToManyField(
         Ingredient,
@@ -84,9 +93,33 @@ class Recipe(models.Model):
         auto_now_add=True,
         verbose_name='Время публикации',
     )
+    favorites_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Добавлений в избранное'
+    )
+    in_carts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Добавлений в список покупок'
+    )
 
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['-pub_date'],
+                name='recipe_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date'],
+                name='recipe_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['-favorites_count', '-pub_date'],
+                name='recipe_popularity_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -111,6 +144,14 @@ class IngredientInRecipe(models.Model):
         verbose_name='Количество'
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('recipe', 'ingredient'),
+                name='unique_ingredient_in_recipe'
+            )
+        ]
+
 
 class TagInRecipe(models.Model):
 
@@ -124,6 +165,14 @@ class TagInRecipe(models.Model):
         on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('recipe', 'tags'),
+                name='unique_tag_in_recipe'
+            )
+        ]
+
 
 class Favorite(models.Model):
     recipe = models.ForeignKey(
@@ -142,6 +191,12 @@ class Favorite(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at'],
+                name='favorite_user_created_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('user', 'recipe'),
@@ -171,6 +226,45 @@ class ShoppingCart(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ('user', 'recipe')
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at'],
+                name='cart_user_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.user} добавил {self.recipe} в список покупок'
+
+
+class FeedItem(models.Model):
+    """Рецепт в ленте подписчика автора, см. recipes.feed."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed',
+        verbose_name='Юзер'
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='feed_items',
+        verbose_name='Рецепт'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date'],
+                name='feed_user_pub_date_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'recipe'),
+                name='unique_feed_item'
+            )
+        ]
@@ -0,0 +1,52 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Индексы и триггеры создаются миграцией 0007_recipe_search.
+POSTGRESQL_QUERY = "websearch_to_tsquery('russian', %s)"
+WORD = re.compile(r'\w+')
+
+
+def fts5_query(query):
+    """Слова запроса как префиксы, чтобы не ломаться на синтаксисе FTS5."""
+    return ' '.join(f'"{word}"*' for word in WORD.findall(query))
+
+
+def search_recipes(queryset, query):
+    """Фильтрует рецепты по названию и описанию и добавляет search_rank.
+
+    Чем выше search_rank, тем релевантнее рецепт.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.filter(RawSQL(
+            f'recipes_recipe.search_vector @@ {POSTGRESQL_QUERY}',
+            (query,), output_field=BooleanField()
+        )).annotate(search_rank=RawSQL(
+            f'ts_rank_cd(recipes_recipe.search_vector, {POSTGRESQL_QUERY})',
+            (query,), output_field=FloatField()
+        ))
+    if vendor == 'sqlite':
+        query = fts5_query(query)
+        if not query:
+            # Запрос без слов ничего не находит, но порядок по search_rank
+            # должен работать и для пустого результата.
+            return queryset.none().annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            )
+        return queryset.filter(id__in=RawSQL(
+            'SELECT rowid FROM recipes_recipe_fts '
+            'WHERE recipes_recipe_fts MATCH %s',
+            (query,)
+        )).annotate(search_rank=RawSQL(
+            # bm25 тем меньше, чем лучше совпадение; название весит больше.
+            'SELECT -bm25(recipes_recipe_fts, 10.0, 1.0) '
+            'FROM recipes_recipe_fts WHERE recipes_recipe_fts MATCH %s '
+            'AND rowid = recipes_recipe.id',
+            (query,), output_field=FloatField()
+        ))
+    return queryset.filter(
+        Q(name__icontains=query) | Q(text__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,86 @@
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .models import Recipe
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = 'recipes/thumbnails'
+THUMBNAIL_SIZES = {
+    'card': (480, 360),
+    'detail': (1200, 900),
+}
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.THUMBNAIL_WORKERS,
+    thread_name_prefix='thumbnails'
+) if settings.THUMBNAIL_WORKERS else None
+
+
+def thumbnail_name(image_name, size, extension):
+    stem = os.path.splitext(os.path.basename(image_name))[0]
+    return f'{THUMBNAIL_DIR}/{stem}_{size}.{extension}'
+
+
+def thumbnail_names(image_name):
+    return [
+        thumbnail_name(image_name, size, extension)
+        for size in THUMBNAIL_SIZES
+        for extension in THUMBNAIL_FORMATS
+    ]
+
+
+def make_thumbnails(image_name):
+    with default_storage.open(image_name) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image = image.convert('RGB')
+    for size, dimensions in THUMBNAIL_SIZES.items():
+        thumbnail = image.copy()
+        thumbnail.thumbnail(dimensions, Image.LANCZOS)
+        for extension, (image_format, params) in THUMBNAIL_FORMATS.items():
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, image_format, **params)
+            name = thumbnail_name(image_name, size, extension)
+            default_storage.delete(name)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def process_recipe(recipe_id, image_name):
+    """Создает превью и отмечает рецепт, если картинка не сменилась."""
+    try:
+        make_thumbnails(image_name)
+    except Exception:
+        logger.exception('Не удалось создать превью для %s', image_name)
+        return False
+    Recipe.objects.filter(id=recipe_id, image=image_name).update(
+        thumbnails_ready=True
+    )
+    return True
+
+
+def process_in_background(recipe_id, image_name):
+    try:
+        process_recipe(recipe_id, image_name)
+    finally:
+        close_old_connections()
+
+
+def schedule_thumbnails(recipe):
+    if executor is None or not recipe.image:
+        return
+    recipe_id, image_name = recipe.id, recipe.image.name
+    transaction.on_commit(lambda: executor.submit(
+        process_in_background, recipe_id, image_name
+    ))
@@ -0,0 +1,85 @@
+import asyncio
+import importlib
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.urls import clear_url_caches
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        connection.vendor == 'sqlite',
+        reason='Соединение с тестовой базой SQLite в памяти не закрывается'
+    ),
+]
+
+REQUESTS = 16
+
+
+def reload_urls():
+    import api.urls
+    import foodgram.urls
+
+    importlib.reload(api.urls)
+    importlib.reload(foodgram.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_views(settings, monkeypatch):
+    """Маршруты как под foodgram.asgi, соединения без CONN_MAX_AGE."""
+    monkeypatch.setitem(connections.settings['default'], 'CONN_MAX_AGE', 0)
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+@pytest.fixture
+def pool_connections():
+    """Соединения, открытые потоками пула api.concurrency."""
+    opened = []
+
+    def record(sender, connection, **kwargs):
+        if threading.current_thread().name.startswith('api'):
+            opened.append(connection)
+
+    connection_created.connect(record)
+    yield opened
+    connection_created.disconnect(record)
+
+
+async def get(path):
+    communicator = ApplicationCommunicator(ASGIHandler(), {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [],
+    })
+    await communicator.send_input({'type': 'http.request'})
+    start = await communicator.receive_output(timeout=10)
+    await communicator.receive_output(timeout=10)
+    return start['status']
+
+
+@async_to_sync
+async def get_many(path, count):
+    return await asyncio.gather(*(get(path) for _ in range(count)))
+
+
+def test_offloaded_views_close_connections(
+    async_views, pool_connections, make_recipes
+):
+    make_recipes(2)
+    assert get_many('/api/recipes/', REQUESTS) == [200] * REQUESTS
+    assert pool_connections
+    assert all(
+        connection.connection is None for connection in pool_connections
+    )
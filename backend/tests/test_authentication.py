@@ -0,0 +1,90 @@
+import pytest
+from api.authentication import CachedTokenAuthentication, local_tokens
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+
+@pytest.fixture
+def cached_auth(monkeypatch):
+    """Кэш токенов включен, как с общим CACHE_BACKEND."""
+    monkeypatch.setattr(
+        APIView, 'authentication_classes', [CachedTokenAuthentication]
+    )
+
+
+def authenticate(key):
+    return CachedTokenAuthentication().authenticate_credentials(key)[0]
+
+
+def test_local_cache_backend_uses_plain_tokens():
+    assert not settings.TOKEN_CACHE
+    assert [
+        auth.__name__ for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    ] == ['TokenAuthentication']
+
+
+def test_cached_token_skips_database(cached_auth, token, user,
+                                     django_assert_num_queries):
+    assert authenticate(token.key) == user
+    with django_assert_num_queries(0):
+        assert authenticate(token.key) == user
+    local_tokens.clear()
+    with django_assert_num_queries(0):
+        assert authenticate(token.key) == user
+
+
+def test_logout_revokes_token(cached_auth, token,
+                              django_capture_on_commit_callbacks):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    assert client.get('/api/users/me/').status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post('/api/auth/token/logout/')
+    assert response.status_code == 204
+    assert client.get('/api/users/me/').status_code == 401
+
+
+def test_password_change_reloads_user(cached_auth, token, user,
+                                      django_capture_on_commit_callbacks):
+    authenticate(token.key)
+    with django_capture_on_commit_callbacks(execute=True):
+        user.set_password('new-password')
+        user.save()
+    assert authenticate(token.key).check_password('new-password')
+
+
+@pytest.mark.parametrize('other_worker', [False, True])
+def test_deactivation_revokes_token(cached_auth, token, user, other_worker,
+                                    django_capture_on_commit_callbacks):
+    authenticate(token.key)
+    with django_capture_on_commit_callbacks(execute=True):
+        user.is_active = False
+        user.save()
+    if other_worker:
+        # В другом воркере своего LRU нет, есть только запись общего кэша.
+        local_tokens.clear()
+    with pytest.raises(AuthenticationFailed):
+        authenticate(token.key)
+
+
+def test_other_user_changes_keep_token_cached(
+    cached_auth, token, user, author, django_assert_num_queries,
+    django_capture_on_commit_callbacks
+):
+    authenticate(token.key)
+    with django_capture_on_commit_callbacks(execute=True):
+        author.first_name = 'Автор'
+        author.save()
+    with django_assert_num_queries(0):
+        assert authenticate(token.key) == user
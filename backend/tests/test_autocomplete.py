@@ -0,0 +1,38 @@
+import pytest
+from api.autocomplete import AUTOCOMPLETE_LIMIT
+from django.core.cache import cache
+from recipes.models import Ingredient
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize('name', [
+    '', 'Ингр', 'диент 5', 'соль', 'нет такого'
+])
+def test_index_and_database_agree(client, settings, ingredients, name):
+    Ingredient.objects.bulk_create([
+        Ingredient(name='соль', measurement_unit='г'),
+        Ingredient(name='морская соль', measurement_unit='г'),
+        Ingredient(name='соль', measurement_unit='щепотка'),
+    ])
+    url = f'/api/ingredients/?name={name}'
+    results = []
+    for enabled in (True, False):
+        settings.INGREDIENT_INDEX = enabled
+        cache.clear()
+        results.append(client.get(url).data)
+    index, database = results
+    assert index == database
+    assert len(index) <= AUTOCOMPLETE_LIMIT
+
+
+def test_prefix_matches_first(client, settings):
+    settings.INGREDIENT_INDEX = False
+    Ingredient.objects.bulk_create([
+        Ingredient(name='морская соль', measurement_unit='г'),
+        Ingredient(name='соль', measurement_unit='г'),
+    ])
+    response = client.get('/api/ingredients/?name=соль')
+    assert [item['name'] for item in response.data] == [
+        'соль', 'морская соль'
+    ]
@@ -0,0 +1,56 @@
+import pytest
+from recipes.models import Favorite, Recipe, ShoppingCart
+
+pytestmark = pytest.mark.django_db
+
+# Выборка удаляемых и SAVEPOINT, DELETE, блокировка рецептов, пересчет
+# счетчиков, RELEASE.
+DELETE_QUERIES = 6
+
+
+@pytest.mark.parametrize('path, model, counter', [
+    ('favorite', Favorite, 'favorites_count'),
+    ('shopping_cart', ShoppingCart, 'in_carts_count'),
+])
+@pytest.mark.parametrize('count', [1, 50])
+def test_batch_delete(
+    user, user_client, make_recipes, django_assert_num_queries,
+    path, model, counter, count
+):
+    recipes = make_recipes(count)
+    ids = [recipe.id for recipe in recipes]
+    url = f'/api/recipes/{path}/batch/'
+    response = user_client.post(url, {'ids': ids}, format='json')
+    assert response.status_code == 200
+    assert set(
+        Recipe.objects.filter(id__in=ids).values_list(counter, flat=True)
+    ) == {1}
+
+    with django_assert_num_queries(DELETE_QUERIES):
+        response = user_client.delete(
+            url, {'ids': ids + [10 ** 6]}, format='json'
+        )
+    assert response.status_code == 200
+    assert response.data['results'][-1] == {'id': 10 ** 6, 'status': 'missing'}
+    assert not model.objects.filter(user=user).exists()
+    assert set(
+        Recipe.objects.filter(id__in=ids).values_list(counter, flat=True)
+    ) == {0}
+
+
+def test_batch_delete_refreshes_shopping_list(
+    user_client, make_recipes, django_capture_on_commit_callbacks
+):
+    recipe, = make_recipes(1)
+    user_client.post(
+        '/api/recipes/shopping_cart/batch/', {'ids': [recipe.id]},
+        format='json'
+    )
+    url = '/api/recipes/download_shopping_cart/?format=txt'
+    assert 'Ингредиент 0' in user_client.get(url).getvalue().decode()
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.delete(
+            '/api/recipes/shopping_cart/batch/', {'ids': [recipe.id]},
+            format='json'
+        )
+    assert 'Ингредиент' not in user_client.get(url).getvalue().decode()
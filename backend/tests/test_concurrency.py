@@ -0,0 +1,125 @@
+import threading
+from collections import Counter
+
+import pytest
+from django.db import connection, connections
+from recipes.models import Favorite, Recipe, ShoppingCart
+from rest_framework.test import APIClient
+
+THREADS = 8
+ROUNDS = 20
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        connection.vendor == 'sqlite',
+        reason='SQLite не допускает параллельной записи'
+    ),
+]
+
+
+def hammer(user, method, url):
+    """Одновременно шлет THREADS одинаковых запросов, возвращает статусы."""
+    barrier = threading.Barrier(THREADS)
+    statuses = []
+    lock = threading.Lock()
+
+    def send():
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            barrier.wait()
+            status = getattr(client, method)(url).status_code
+            with lock:
+                statuses.append(status)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=send) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return Counter(statuses)
+
+
+@pytest.mark.parametrize('path, model, counter', [
+    ('favorite', Favorite, 'favorites_count'),
+    ('shopping_cart', ShoppingCart, 'in_carts_count'),
+])
+def test_concurrent_toggle(user, make_recipes, path, model, counter):
+    recipe, = make_recipes(1)
+    url = f'/api/recipes/{recipe.id}/{path}/'
+
+    assert hammer(user, 'post', url) == {201: 1, 400: THREADS - 1}
+    assert model.objects.filter(user=user, recipe=recipe).count() == 1
+    assert getattr(Recipe.objects.get(id=recipe.id), counter) == 1
+
+    assert hammer(user, 'delete', url) == {204: 1, 400: THREADS - 1}
+    assert not model.objects.filter(user=user, recipe=recipe).exists()
+    assert getattr(Recipe.objects.get(id=recipe.id), counter) == 0
+
+
+@pytest.mark.parametrize('path, model, counter', [
+    ('favorite', Favorite, 'favorites_count'),
+    ('shopping_cart', ShoppingCart, 'in_carts_count'),
+])
+def test_batch_with_concurrent_toggles(
+    django_user_model, make_recipes, path, model, counter
+):
+    recipes = make_recipes(3)
+    ids = [recipe.id for recipe in recipes]
+    users = [
+        django_user_model.objects.create_user(
+            username=f'user{number}', email=f'user{number}@example.com'
+        )
+        for number in range(THREADS)
+    ]
+    barrier = threading.Barrier(THREADS)
+    statuses = []
+    lock = threading.Lock()
+
+    def toggle(user, batch):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            barrier.wait()
+            for _ in range(ROUNDS):
+                if batch:
+                    url = f'/api/recipes/{path}/batch/'
+                    responses = [
+                        client.post(url, {'ids': ids}, format='json'),
+                        client.delete(url, {'ids': ids[1:]}, format='json'),
+                    ]
+                else:
+                    responses = [
+                        client.post(f'/api/recipes/{pk}/{path}/')
+                        for pk in ids
+                    ] + [
+                        client.delete(f'/api/recipes/{pk}/{path}/')
+                        for pk in ids[1:]
+                    ]
+                with lock:
+                    statuses.extend(
+                        response.status_code for response in responses
+                    )
+        finally:
+            connections.close_all()
+
+    threads = [
+        threading.Thread(target=toggle, args=(user, number % 2))
+        for number, user in enumerate(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(statuses) < 500
+    counts = {
+        recipe.id: getattr(recipe, counter)
+        for recipe in Recipe.objects.filter(id__in=ids)
+    }
+    assert counts == {
+        pk: model.objects.filter(recipe_id=pk).count() for pk in ids
+    }
+    assert counts[ids[0]] == THREADS
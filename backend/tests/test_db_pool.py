@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, connections
+from django.test import RequestFactory
+from psycopg2.pool import PoolError
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql', reason='Пул есть только у PostgreSQL'
+)
+
+
+@pytest.fixture
+def make_pool(django_db_blocker):
+    from foodgram.db.postgresql.base import BlockingConnectionPool
+
+    pools = []
+
+    def make_pool(size, timeout):
+        with django_db_blocker.unblock():
+            pool = BlockingConnectionPool(
+                size, size, timeout=timeout,
+                **connection.get_connection_params()
+            )
+        pools.append(pool)
+        return pool
+
+    yield make_pool
+    for pool in pools:
+        pool.closeall()
+
+
+def test_pool_waits_for_free_connection(make_pool):
+    pool = make_pool(2, timeout=5)
+    errors = []
+
+    def work():
+        try:
+            conn = pool.getconn()
+            time.sleep(0.05)
+            pool.putconn(conn)
+        except PoolError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(pool._pool) == 2
+
+
+def test_pool_times_out_when_exhausted(make_pool):
+    pool = make_pool(1, timeout=0.1)
+    conn = pool.getconn()
+    with pytest.raises(PoolError):
+        pool.getconn()
+    pool.putconn(conn)
+    pool.putconn(pool.getconn())
+
+
+@pytest.fixture
+def pooled_settings(monkeypatch):
+    """Пул из двух соединений при CONN_MAX_AGE по умолчанию."""
+    from foodgram.db.postgresql import base
+
+    settings_dict = connections.settings['default']
+    for key, value in (
+        ('ENGINE', 'foodgram.db.postgresql'), ('POOL_SIZE', 2),
+        ('POOL_TIMEOUT', 2), ('CONN_MAX_AGE', 60),
+    ):
+        monkeypatch.setitem(settings_dict, key, value)
+    yield
+    for key in list(base._pools):
+        base._pools.pop(key).closeall()
+
+
+def get(path):
+    """Запрос через WSGIHandler.
+
+    В отличие от тестового клиента он закрывает соединения с БД в конце
+    запроса, как настоящий сервер.
+    """
+    statuses = []
+    response = WSGIHandler()(
+        RequestFactory().get(path).environ,
+        lambda status, headers: statuses.append(int(status.split()[0]))
+    )
+    response.close()
+    return statuses[0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_more_threads_than_pool(pooled_settings):
+    start = threading.Barrier(8)
+    done = threading.Barrier(8, timeout=30)
+    statuses = []
+
+    def work():
+        start.wait()
+        try:
+            statuses.extend(get('/api/recipes/') for _ in range(3))
+            # Поток жив и не закрыл соединения сам, как поток воркера.
+            done.wait()
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert statuses == [200] * 24
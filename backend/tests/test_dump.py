@@ -0,0 +1,59 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from recipes.dump import get_models
+from recipes.models import Favorite, Ingredient, Recipe, ShoppingCart
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture
+def dump(tmp_path, user, make_recipes):
+    recipe, _ = make_recipes(2)
+    Favorite.objects.create(user=user, recipe=recipe)
+    ShoppingCart.objects.create(user=user, recipe=recipe)
+    call_command('export_data', str(tmp_path / 'dump'), stdout=StringIO())
+    return tmp_path / 'dump'
+
+
+def clear_database():
+    for model in reversed(get_models()):
+        model.objects.all().delete()
+
+
+def test_import_into_empty_database(dump):
+    names = sorted(Recipe.objects.values_list('name', 'author__username'))
+    clear_database()
+    call_command('import_data', str(dump), stdout=StringIO())
+    assert sorted(
+        Recipe.objects.values_list('name', 'author__username')
+    ) == names
+    recipe = Recipe.objects.get(favorite__isnull=False)
+    assert (recipe.favorites_count, recipe.in_carts_count) == (1, 1)
+    assert User.objects.get(username='author').recipes_count == 2
+
+
+def test_import_counts_only_imported_rows(dump):
+    clear_database()
+    # Счетчики в выгрузке могли разойтись с ее строками.
+    lines = (dump / 'data.ndjson').read_text(encoding='utf-8')
+    assert '"favorites_count": 1' in lines
+    (dump / 'data.ndjson').write_text(
+        lines.replace('"favorites_count": 1', '"favorites_count": 7'),
+        encoding='utf-8'
+    )
+    call_command('import_data', str(dump), stdout=StringIO())
+    assert Recipe.objects.get(favorite__isnull=False).favorites_count == 1
+
+
+def test_import_refuses_non_empty_database(dump):
+    clear_database()
+    Ingredient.objects.create(name='Соль', measurement_unit='г')
+    with pytest.raises(CommandError, match='recipes.Ingredient'):
+        call_command('import_data', str(dump), stdout=StringIO())
+    assert not Recipe.objects.exists()
+    assert not User.objects.exists()
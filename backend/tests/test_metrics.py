@@ -0,0 +1,35 @@
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+from rest_framework.authtoken.models import Token
+
+pytestmark = pytest.mark.django_db
+
+QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def count_queries(response):
+    return int(QUERIES.search(response['Server-Timing']).group(1))
+
+
+@pytest.fixture
+def token(user):
+    return f'Token {Token.objects.create(user=user)}'
+
+
+@pytest.mark.parametrize('url', [
+    '/api/users/subscriptions/', '/api/recipes/', '/api/favorites/'
+])
+def test_server_timing_counts_queries(token, make_recipes, url):
+    make_recipes(2)
+    # Первый запрос прогревает кэши, дальше оба клиента в равных условиях.
+    Client().get(url, HTTP_AUTHORIZATION=token)
+    sync_response = Client().get(url, HTTP_AUTHORIZATION=token)
+    async_response = async_to_sync(AsyncClient().get)(
+        url, authorization=token
+    )
+    assert sync_response.status_code == async_response.status_code == 200
+    assert count_queries(sync_response) > 0
+    assert count_queries(async_response) == count_queries(sync_response)
@@ -0,0 +1,139 @@
+import pytest
+from recipes.models import (Favorite, IngredientInRecipe, Recipe, ShoppingCart,
+                            TagInRecipe)
+from users.models import Follow
+
+pytestmark = pytest.mark.django_db
+
+# Пагинация, рецепты, теги и ингредиенты рецептов.
+LIST_QUERIES = 4
+# Избранное, корзина и подписки пользователя одним запросом каждое.
+USER_QUERIES = 3
+# Запись рецепта не зависит от числа ингредиентов: проверка тегов идет
+# по запросу на тег, ингредиенты проверяются и пишутся пачками.
+CREATE_QUERIES = 14
+UPDATE_QUERIES = 17
+UNCHANGED_UPDATE_QUERIES = 14
+
+
+@pytest.mark.parametrize('count', [1, 6])
+def test_recipe_list_anonymous(
+    client, make_recipes, django_assert_num_queries, count
+):
+    make_recipes(count)
+    with django_assert_num_queries(LIST_QUERIES):
+        response = client.get('/api/recipes/')
+    assert response.status_code == 200
+    assert len(response.data['results']) == count
+
+
+@pytest.mark.parametrize('count', [1, 6])
+def test_recipe_list_authenticated(
+    user, author, user_client, make_recipes, django_assert_num_queries, count
+):
+    recipes = make_recipes(count)
+    Favorite.objects.create(user=user, recipe=recipes[0])
+    ShoppingCart.objects.create(user=user, recipe=recipes[-1])
+    Follow.objects.create(user=user, following=author)
+    with django_assert_num_queries(LIST_QUERIES + USER_QUERIES):
+        response = user_client.get('/api/recipes/')
+    assert response.status_code == 200
+    results = response.data['results']
+    assert len(results) == count
+    assert results[-1]['is_favorited']
+    assert results[0]['is_in_shopping_cart']
+    assert all(result['author']['is_subscribed'] for result in results)
+    assert all(len(result['ingredients']) == 3 for result in results)
+
+
+def test_recipe_detail_anonymous(
+    client, make_recipes, django_assert_num_queries
+):
+    recipe, = make_recipes(1)
+    with django_assert_num_queries(LIST_QUERIES - 1):
+        response = client.get(f'/api/recipes/{recipe.id}/')
+    assert response.status_code == 200
+
+
+def test_recipe_detail_authenticated(
+    user_client, make_recipes, django_assert_num_queries
+):
+    recipe, = make_recipes(1)
+    with django_assert_num_queries(LIST_QUERIES - 1 + USER_QUERIES):
+        response = user_client.get(f'/api/recipes/{recipe.id}/')
+    assert response.status_code == 200
+    assert len(response.data['ingredients']) == 3
+
+
+IMAGE = (
+    'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABAgMAAABieywaAAAA'
+    'CVBMVEUAAAD///9fX1/S0ecCAAAACXBIWXMAAA7EAAAOxAGVKw4bAAAACklEQVQImWNoAAAA'
+    'ggCByxOyYQAAAABJRU5ErkJggg=='
+)
+
+
+def recipe_payload(ingredients, tags, amount=10):
+    return {
+        'name': 'Рецепт',
+        'text': 'Описание',
+        'cooking_time': 15,
+        'image': IMAGE,
+        'tags': [tag.id for tag in tags],
+        'ingredients': [
+            {'id': ingredient.id, 'amount': amount}
+            for ingredient in ingredients
+        ],
+    }
+
+
+def test_recipe_create_50_ingredients(
+    author_client, tags, ingredients, django_assert_num_queries
+):
+    payload = recipe_payload(ingredients[:50], tags)
+    with django_assert_num_queries(CREATE_QUERIES):
+        response = author_client.post(
+            '/api/recipes/', payload, format='json'
+        )
+    assert response.status_code == 201
+    recipe = Recipe.objects.get(id=response.data['id'])
+    assert recipe.ingredient_amounts.count() == 50
+    assert recipe.tags.count() == 2
+
+
+def test_recipe_update_50_ingredients(
+    author_client, tags, ingredients, django_assert_num_queries
+):
+    response = author_client.post(
+        '/api/recipes/', recipe_payload(ingredients[:50], tags), format='json'
+    )
+    recipe_id = response.data['id']
+    # 5 ингредиентов убраны, 5 добавлены, у 5 изменилось количество.
+    payload = recipe_payload(ingredients[5:55], tags[:1])
+    for ingredient in payload['ingredients'][:5]:
+        ingredient['amount'] = 20
+    with django_assert_num_queries(UPDATE_QUERIES):
+        response = author_client.put(
+            f'/api/recipes/{recipe_id}/', payload, format='json'
+        )
+    assert response.status_code == 200
+    amounts = dict(IngredientInRecipe.objects.filter(
+        recipe_id=recipe_id
+    ).values_list('ingredient_id', 'amount'))
+    assert set(amounts) == {ingredient.id for ingredient in ingredients[5:55]}
+    assert amounts[ingredients[5].id] == 20
+    assert amounts[ingredients[54].id] == 10
+    assert list(TagInRecipe.objects.filter(
+        recipe_id=recipe_id
+    ).values_list('tags_id', flat=True)) == [tags[0].id]
+
+
+def test_recipe_update_unchanged_ingredients(
+    author_client, tags, ingredients, django_assert_num_queries
+):
+    payload = recipe_payload(ingredients[:50], tags)
+    response = author_client.post('/api/recipes/', payload, format='json')
+    with django_assert_num_queries(UNCHANGED_UPDATE_QUERIES):
+        response = author_client.put(
+            f'/api/recipes/{response.data["id"]}/', payload, format='json'
+        )
+    assert response.status_code == 200
@@ -0,0 +1,28 @@
+import pytest
+
+from .test_queries import recipe_payload
+
+pytestmark = pytest.mark.django_db
+
+INTERNAL_FIELDS = {'favorites_count', 'in_carts_count', 'thumbnails_ready'}
+
+
+def test_read_payload_hides_internal_fields(client, make_recipes):
+    recipe, = make_recipes(1)
+    detail = client.get(f'/api/recipes/{recipe.id}/').data
+    listed = client.get('/api/recipes/').data['results'][0]
+    assert set(detail) == set(listed) == {
+        'id', 'image', 'thumbnails', 'author', 'ingredients', 'tags',
+        'is_favorited', 'is_in_shopping_cart', 'name', 'text',
+        'cooking_time', 'pub_date',
+    }
+
+
+def test_write_payload_hides_internal_fields(
+    author_client, tags, ingredients
+):
+    response = author_client.post(
+        '/api/recipes/', recipe_payload(ingredients[:2], tags), format='json'
+    )
+    assert response.status_code == 201
+    assert not INTERNAL_FIELDS & set(response.data)
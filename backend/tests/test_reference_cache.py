@@ -0,0 +1,31 @@
+import pytest
+from api.cache import INGREDIENTS_VERSION_KEY, TAGS_VERSION_KEY
+from django.core.cache import cache
+from recipes.models import Ingredient, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+def expire_check(key):
+    """Как будто прошло TABLE_CHECK_INTERVAL секунд."""
+    cache.delete(f'{key}:checked')
+
+
+def test_tags_notice_rows_from_other_process(client, tags):
+    assert len(client.get('/api/tags/').data) == 2
+    # bulk_create не отправляет сигналы, как и запись из другого процесса
+    # с собственным LocMemCache.
+    Tag.objects.bulk_create([Tag(name='Ужин', color='#8775D2', slug='dinner')])
+    assert len(client.get('/api/tags/').data) == 2
+    expire_check(TAGS_VERSION_KEY)
+    assert len(client.get('/api/tags/').data) == 3
+
+
+def test_ingredient_index_notices_rows_from_other_process(client):
+    url = '/api/ingredients/?name=соль'
+    assert client.get(url).data == []
+    Ingredient.objects.bulk_create(
+        [Ingredient(name='соль', measurement_unit='г')]
+    )
+    expire_check(INGREDIENTS_VERSION_KEY)
+    assert [item['name'] for item in client.get(url).data] == ['соль']
@@ -0,0 +1,53 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def recipes(make_recipes):
+    first, second = make_recipes(2)
+    first.name = 'Творожные сырники'
+    first.save()
+    second.name = 'Запеканка'
+    second.text = 'Тот же творог, что и на сырники, только в духовке'
+    second.save()
+    return first, second
+
+
+def test_search_ranks_name_first(client, recipes):
+    response = client.get('/api/recipes/', {'search': 'сырники'})
+    assert response.status_code == 200
+    assert [recipe['id'] for recipe in response.data['results']] == [
+        recipe.id for recipe in recipes
+    ]
+
+
+@pytest.mark.parametrize('query', ['"\').(', '***', '-', '"', 'OR AND NOT'])
+def test_search_odd_input(client, recipes, query):
+    response = client.get('/api/recipes/', {'search': query})
+    assert response.status_code == 200
+
+
+def test_search_punctuation_only_is_empty(client, recipes):
+    response = client.get('/api/recipes/', {'search': '"\').('})
+    assert response.status_code == 200
+    assert response.data['results'] == []
+
+
+@pytest.mark.parametrize('params', [
+    {'search': 'сырники'}, {'ordering': '-favorites_count'}
+])
+def test_cursor_rejects_own_ordering(client, recipes, params):
+    response = client.get(
+        '/api/recipes/', {'pagination': 'cursor', **params}
+    )
+    assert response.status_code == 400
+    assert list(response.data) == list(params)
+
+
+def test_cursor_ignores_empty_search(client, recipes):
+    response = client.get(
+        '/api/recipes/', {'pagination': 'cursor', 'search': ' '}
+    )
+    assert response.status_code == 200
+    assert len(response.data['results']) == 2
@@ -0,0 +1,25 @@
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+URL = '/api/recipes/download_shopping_cart/'
+
+
+@pytest.mark.parametrize('query', ['', '?format=pdf', '?format=csv',
+                                   '?format=txt', '?format=json'])
+def test_download_errors_are_json(client, query):
+    response = client.get(URL + query)
+    assert response.status_code == 401
+    assert response['Content-Type'] == 'application/json; charset=utf-8'
+    assert 'detail' in response.json()
+
+
+@pytest.mark.parametrize('query, content_type', [
+    ('', 'application/pdf'),
+    ('?format=csv', 'text/csv; charset=utf-8'),
+    ('?format=txt', 'text/plain; charset=utf-8'),
+])
+def test_download_keeps_negotiated_type(user_client, query, content_type):
+    response = user_client.get(URL + query)
+    assert response.status_code == 200
+    assert response['Content-Type'] == content_type
@@ -0,0 +1,23 @@
+import pytest
+from recipes.thumbnails import THUMBNAIL_DIR
+
+pytestmark = pytest.mark.django_db
+
+
+def test_recipe_hides_thumbnails_ready(client, make_recipes):
+    recipe, = make_recipes(1)
+    response = client.get(f'/api/recipes/{recipe.id}/')
+    assert 'thumbnails_ready' not in response.data
+    assert response.data['thumbnails'] is None
+
+
+def test_recipe_thumbnails_when_ready(client, make_recipes):
+    recipe, = make_recipes(1)
+    recipe.image = 'recipe.png'
+    recipe.thumbnails_ready = True
+    recipe.save()
+    response = client.get(f'/api/recipes/{recipe.id}/')
+    assert 'thumbnails_ready' not in response.data
+    assert response.data['thumbnails']['card']['webp'].endswith(
+        f'{THUMBNAIL_DIR}/recipe_card.webp'
+    )
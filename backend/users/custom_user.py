@@ -23,6 +23,8 @@ class UserSerializer(serializers.ModelSerializer):
     def get_is_subscribed(self, obj):
         subscribe = self.context.get('request')
         if subscribe and not subscribe.user.is_anonymous:
+            if 'subscriptions' in self.context:
+                return obj.id in self.context['subscriptions']
             return Follow.objects.filter(
                 user=subscribe.user, following=obj
             ).exists()
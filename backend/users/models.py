@@ -9,6 +9,7 @@ class User(AbstractUser):
     email = models.EmailField(max_length=254, unique=True)
     first_name = models.CharField(max_length=150, blank=True)
     last_name = models.CharField(max_length=150, blank=True)
+    recipes_count = models.PositiveIntegerField(default=0, editable=False)
 
 
 class Follow(models.Model):
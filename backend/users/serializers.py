@@ -18,7 +18,7 @@ class FollowSerializer(serializers.ModelSerializer):
 class SubscriptionsSerializer(serializers.ModelSerializer):
     recipes = serializers.SerializerMethodField()
     is_subscribed = serializers.SerializerMethodField()
-    recipes_count = serializers.SerializerMethodField()
+    recipes_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
@@ -34,15 +34,9 @@ class SubscriptionsSerializer(serializers.ModelSerializer):
         )
 
     def get_is_subscribed(self, obj):
-        request = self.context.get('request')
-        if request is None or request.user.is_anonymous:
-            return 0
-        return Follow.objects.filter(
-            user=request.user, following=obj
-        ).exists()
-
-    def get_recipes_count(self, obj):
-        return obj.recipe.count()
+        # В выдачу попадают только авторы, на которых подписан
+        # текущий пользователь.
+        return True
 
     def get_recipes(self, obj):
         queryset = obj.recipe.all()
@@ -1,9 +1,11 @@
+from api.pagination import OptInCursorPagination
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
+from django.db.models import F, OuterRef, Prefetch, Subquery
 from django.shortcuts import get_object_or_404
+from recipes.models import Recipe
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
@@ -18,6 +20,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     pagination_class = None
+    cursor_ordering = ('follow_id',)
     permission_classes = (AllowAny,)
 
     @action(
@@ -63,13 +66,21 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def subscriptions(self, request):
         user = request.user
-        follower = Follow.objects.filter(user=user)
-        followers = []
-        for follow in follower:
-            followers.append(follow.following)
-        paginator = PageNumberPagination()
-        paginator.page_size = 6
-        result = paginator.paginate_queryset(followers, request)
+        recipes = Recipe.objects.all()
+        recipes_limit = request.query_params.get('recipes_limit')
+        if recipes_limit is not None and recipes_limit.isdigit():
+            recipes = recipes.filter(id__in=Subquery(
+                Recipe.objects.filter(
+                    author_id=OuterRef('author_id')
+                ).values('id')[:int(recipes_limit)]
+            ))
+        followers = User.objects.filter(following__user=user).annotate(
+            follow_id=F('following__id')
+        ).prefetch_related(
+            Prefetch('recipe', queryset=recipes)
+        ).order_by('follow_id')
+        paginator = OptInCursorPagination()
+        result = paginator.paginate_queryset(followers, request, view=self)
         serializer = SubscriptionsSerializer(
             result, many=True, context={
                 'current_user': user,